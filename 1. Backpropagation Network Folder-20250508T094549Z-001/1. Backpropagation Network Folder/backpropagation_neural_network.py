@@ -1,9 +1,22 @@
+# matplotlib only gets imported once the window is being built (see
+# setup_visualization_panel), the network itself lives in neural_network.py
 import numpy as np
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from tkinter import ttk, messagebox, filedialog
 import time
+import threading
+import queue
+from ensemble_training import grid, sweep
+from datasets import Dataset
+from optimizers import OPTIMIZERS
+from decision_boundary import BoundaryCache
+from loss_plot import LossPlot
+# these used to live in this file, so they can still be imported from here
+from neural_network import FULL_BATCH_ROWS, EarlyStopping, NeuralNetwork, TrainingWorker
+
+POLL_MS = 100  # how often the GUI checks on training, so at most 10 redraws a second
+DATASET = "DATA"  # gate_var value when training on a loaded dataset instead of a gate
+PLOT_POINTS = 1000  # most data points drawn on the decision boundary plot
 
 class NeuralNetworkGUI:
     def __init__(self, root):
@@ -31,6 +44,15 @@ class NeuralNetworkGUI:
         self.nn = None
         self.losses = []
         self.current_gate = None
+        self.current_data = None  # Dataset the network was trained on
+        self.dataset = None  # loaded from a file, used when "Dataset" is selected
+        self.worker = None  # TrainingWorker while a run is going
+        self.sweep_thread = None
+        self.sweep_results = queue.Queue()
+        self.boundary = BoundaryCache()  # decision boundary grid for the last weights drawn
+        self.boundary_key = None  # which weights the boundary plot shows right now
+        self.boundary_axes = None  # data and bounds the boundary axes are set up for
+        self.boundary_contour = None
         
     def setup_control_panel(self):
         # Gate selection
@@ -41,14 +63,18 @@ class NeuralNetworkGUI:
         ttk.Radiobutton(gate_frame, text="AND", variable=self.gate_var, value="AND").pack(side=tk.LEFT, padx=5)
         ttk.Radiobutton(gate_frame, text="OR", variable=self.gate_var, value="OR").pack(side=tk.LEFT, padx=5)
         ttk.Radiobutton(gate_frame, text="XOR", variable=self.gate_var, value="XOR").pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(gate_frame, text="Dataset", variable=self.gate_var, value=DATASET).pack(side=tk.LEFT, padx=5)
+        ttk.Button(gate_frame, text="Load Dataset...", command=self.load_dataset).pack(side=tk.LEFT, padx=5)
+        self.dataset_var = tk.StringVar(value="(none loaded)")
+        ttk.Label(gate_frame, textvariable=self.dataset_var).pack(side=tk.LEFT, padx=5)
         
         # Network configuration
         config_frame = ttk.LabelFrame(self.tab_control, text="Network Configuration", padding=10)
         config_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Label(config_frame, text="Hidden Layer Size:").grid(row=0, column=0, sticky=tk.W)
-        self.hidden_size = tk.IntVar(value=4)
-        ttk.Entry(config_frame, textvariable=self.hidden_size, width=5).grid(row=0, column=1, sticky=tk.W)
+        ttk.Label(config_frame, text="Hidden Layer Sizes:").grid(row=0, column=0, sticky=tk.W)
+        self.hidden_size = tk.StringVar(value="4")  # "8,4" = two hidden layers
+        ttk.Entry(config_frame, textvariable=self.hidden_size, width=8).grid(row=0, column=1, sticky=tk.W)
         
         ttk.Label(config_frame, text="Learning Rate:").grid(row=1, column=0, sticky=tk.W)
         self.learning_rate = tk.DoubleVar(value=0.1)
@@ -58,12 +84,56 @@ class NeuralNetworkGUI:
         self.epochs = tk.IntVar(value=10000)
         ttk.Entry(config_frame, textvariable=self.epochs, width=5).grid(row=2, column=1, sticky=tk.W)
         
+        ttk.Label(config_frame, text="Batch Size (0 = all):").grid(row=3, column=0, sticky=tk.W)
+        self.batch_size = tk.IntVar(value=0)
+        ttk.Entry(config_frame, textvariable=self.batch_size, width=5).grid(row=3, column=1, sticky=tk.W)
+        
+        ttk.Label(config_frame, text="Optimizer:").grid(row=0, column=2, sticky=tk.W, padx=(20, 0))
+        self.optimizer = tk.StringVar(value="sgd")
+        ttk.Combobox(config_frame, textvariable=self.optimizer, values=list(OPTIMIZERS),
+                     state="readonly", width=10).grid(row=0, column=3, sticky=tk.W)
+        
+        # early stopping, 0 turns either one off
+        ttk.Label(config_frame, text="Stop at Loss (0 = off):").grid(row=1, column=2, sticky=tk.W, padx=(20, 0))
+        self.target_loss = tk.DoubleVar(value=0.0)
+        ttk.Entry(config_frame, textvariable=self.target_loss, width=8).grid(row=1, column=3, sticky=tk.W)
+        
+        ttk.Label(config_frame, text="Plateau Patience (0 = off):").grid(row=2, column=2, sticky=tk.W, padx=(20, 0))
+        self.patience = tk.IntVar(value=0)
+        ttk.Entry(config_frame, textvariable=self.patience, width=8).grid(row=2, column=3, sticky=tk.W)
+        
         # Training controls
         train_frame = ttk.LabelFrame(self.tab_control, text="Training", padding=10)
         train_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(train_frame, text="Train Network", command=self.train_network).pack(side=tk.LEFT, padx=5)
+        self.train_button = ttk.Button(train_frame, text="Train Network", command=self.train_network)
+        self.train_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(train_frame, text="Test Network", command=self.test_network).pack(side=tk.LEFT, padx=5)
+        self.pause_button = ttk.Button(train_frame, text="Pause", command=self.toggle_pause, state=tk.DISABLED)
+        self.pause_button.pack(side=tk.LEFT, padx=5)
+        self.stop_button = ttk.Button(train_frame, text="Stop", command=self.stop_training, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+        self.progress_var = tk.StringVar(value="")
+        ttk.Label(train_frame, textvariable=self.progress_var).pack(side=tk.LEFT, padx=5)
+        
+        # Sweep: lots of networks trained together, see ensemble_training
+        sweep_frame = ttk.LabelFrame(self.tab_control, text="Hyperparameter Sweep", padding=10)
+        sweep_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(sweep_frame, text="Hidden sizes:").grid(row=0, column=0, sticky=tk.W)
+        self.sweep_hidden = tk.StringVar(value="2,4,8")
+        ttk.Entry(sweep_frame, textvariable=self.sweep_hidden, width=10).grid(row=0, column=1, sticky=tk.W)
+        
+        ttk.Label(sweep_frame, text="Learning rates:").grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+        self.sweep_rates = tk.StringVar(value="0.1,0.5,1")
+        ttk.Entry(sweep_frame, textvariable=self.sweep_rates, width=10).grid(row=0, column=3, sticky=tk.W)
+        
+        ttk.Label(sweep_frame, text="Seeds:").grid(row=0, column=4, sticky=tk.W, padx=(10, 0))
+        self.sweep_seeds = tk.IntVar(value=10)
+        ttk.Entry(sweep_frame, textvariable=self.sweep_seeds, width=5).grid(row=0, column=5, sticky=tk.W)
+        
+        self.sweep_button = ttk.Button(sweep_frame, text="Run Sweep", command=self.run_sweep)
+        self.sweep_button.grid(row=0, column=6, padx=10)
         
         # Results display
         result_frame = ttk.LabelFrame(self.tab_control, text="Results", padding=10)
@@ -77,12 +147,17 @@ class NeuralNetworkGUI:
         self.result_text.configure(yscrollcommand=scrollbar.set)
     
     def setup_visualization_panel(self):
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.cmap = plt.cm.Paired  # decision boundary colors
+        
         # Matplotlib figure
         self.fig, self.ax = plt.subplots(figsize=(8, 5))
         self.ax.set_title("Training Loss Over Epochs")
         self.ax.set_xlabel("Epoch")
         self.ax.set_ylabel("Loss")
         self.ax.grid(True)
+        self.loss_plot = LossPlot(self.ax)  # one line per run, see update_plots
         
         # Canvas for embedding matplotlib in Tkinter
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.tab_visualization)
@@ -104,55 +179,225 @@ class NeuralNetworkGUI:
     def sigmoid(self, x):
         return 1 / (1 + np.exp(-x))
     
-    def train_network(self):
-        # Get selected gate
+    def training(self):
+        return self.worker is not None and self.worker.running()
+    
+    def load_dataset(self):
+        path = filedialog.askopenfilename(
+            title="Load dataset (last column is the target)",
+            filetypes=[("Data", "*.npy *.csv *.txt"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            self.dataset = Dataset.load(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Couldn't load {path}: {e}")
+            return
+        data = self.dataset
+        self.dataset_var.set(f"{data.name}: {len(data)} rows, {data.input_size} inputs")
+        self.gate_var.set(DATASET)
+    
+    def selected_data(self):
+        # truth table of the selected gate, or the loaded dataset
         gate = self.gate_var.get()
-        self.current_gate = gate
-        
-        # Define input and output
-        X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
-        
-        if gate == "AND":
-            y = np.array([[0], [0], [0], [1]])
-        elif gate == "OR":
-            y = np.array([[0], [1], [1], [1]])
-        elif gate == "XOR":
-            y = np.array([[0], [1], [1], [0]])
-        
-        # Initialize network
-        input_size = 2
-        hidden_size = self.hidden_size.get()
-        output_size = 1
+        if gate != DATASET:
+            return Dataset.gate(gate)
+        if self.dataset is None:
+            messagebox.showerror("Error", "Load a dataset first!")
+        return self.dataset
+    
+    def train_network(self):
+        if self.training():
+            return
+        # Get selected gate (or dataset)
+        data = self.selected_data()
+        if data is None:
+            return
+        self.current_data = data
+        self.current_gate = data.name
+        
+        # Initialize network, input and output sizes come from the data
+        try:
+            hidden_size = [int(v) for v in self.hidden_size.get().split(',')]
+        except ValueError:
+            messagebox.showerror("Error", "Hidden layer sizes should look like 4 or 8,4")
+            return
         learning_rate = self.learning_rate.get()
         epochs = self.epochs.get()
+        batch_size = self.batch_size.get() or None
+        options = {"optimizer": self.optimizer.get(),
+                   "target_loss": self.target_loss.get() or None,
+                   "patience": self.patience.get() or None}
         
-        self.nn = NeuralNetwork(input_size, hidden_size, output_size)
+        self.nn = NeuralNetwork(data.input_size, hidden_size, data.output_size)
+        self.losses = []
+        self.loss_plot.new_run(f"{self.describe_data('Gate')} ({self.hidden_size.get()} hidden, "
+                               f"{options['optimizer']}, lr {learning_rate})")
         
-        # Train network
-        self.result_text.insert(tk.END, f"Training {gate} gate network...\n")
+        # Train network on a background thread, poll_training picks up the progress
+        self.result_text.insert(tk.END, f"Training {self.describe_data()} network...\n")
         self.result_text.see(tk.END)
-        self.root.update()
-        
-        self.losses = self.nn.train(X, y, epochs, learning_rate)
         
-        self.result_text.insert(tk.END, f"Training completed for {gate} gate!\n")
+        self.worker = TrainingWorker(self.nn, data, epochs, learning_rate, batch_size, **options)
+        if self.worker.batch_size != batch_size:
+            self.result_text.insert(tk.END, f"{len(data)} rows is too many for full-batch training, "
+                                            f"using batches of {self.worker.batch_size}\n")
+        self.worker.start()
+        self.train_button.config(state=tk.DISABLED)
+        self.pause_button.config(state=tk.NORMAL, text="Pause")
+        self.stop_button.config(state=tk.NORMAL)
+        self.root.after(POLL_MS, self.poll_training)
+    
+    def poll_training(self):
+        # drain everything the worker sent, but only redraw for the newest
+        # progress, so the redraw rate is capped at one per POLL_MS
+        latest = None
+        finished = None
+        while True:
+            try:
+                message = self.worker.updates.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "progress":
+                latest = message
+            else:
+                finished = message
+        
+        if finished is not None:
+            self.training_finished(finished)
+            return
+        if latest is not None:
+            _, epoch, losses, weights = latest
+            self.losses = losses
+            self.progress_var.set(f"Epoch {epoch}/{self.worker.epochs}  Loss: {losses[-1]:.5f}")
+            self.update_plots()
+            # the copies in the message, not self.nn, which the worker is still changing
+            self.plot_decision_boundary(weights, (self.nn, self.nn.version, epoch))
+        self.root.after(POLL_MS, self.poll_training)
+    
+    def training_finished(self, message):
+        self.train_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.DISABLED, text="Pause")
+        self.stop_button.config(state=tk.DISABLED)
+        if message[0] == "error":
+            self.progress_var.set("")
+            messagebox.showerror("Error", f"Training failed: {message[1]}")
+            return
+        _, epochs_run, losses, seconds = message
+        self.losses = losses
+        name = self.describe_data()
+        if self.worker.stopped:
+            self.result_text.insert(tk.END, f"Training stopped for {name} after {epochs_run} epochs\n")
+        elif self.nn.converged_epoch is not None:
+            self.result_text.insert(tk.END, f"Training converged for {name} in {self.nn.converged_epoch} epochs!\n")
+        elif epochs_run < self.worker.epochs:
+            self.result_text.insert(tk.END, f"Training for {name} stopped at a plateau after {epochs_run} epochs\n")
+        else:
+            self.result_text.insert(tk.END, f"Training completed for {name}!\n")
         self.result_text.see(tk.END)
+        self.progress_var.set(f"{epochs_run} epochs in {seconds:.2f} s  Loss: {losses[-1]:.5f}")
         
         # Update visualization
         self.update_plots()
     
+    def run_sweep(self):
+        if self.sweep_thread is not None and self.sweep_thread.is_alive():
+            return
+        try:
+            hidden_sizes = [int(v) for v in self.sweep_hidden.get().split(',')]
+            rates = [float(v) for v in self.sweep_rates.get().split(',')]
+            seeds = range(self.sweep_seeds.get())
+            epochs = self.epochs.get()
+        except (ValueError, tk.TclError):
+            messagebox.showerror("Error", "Sweep values should be comma separated numbers")
+            return
+        data = self.selected_data()
+        if data is None:
+            return
+        gate = data.name
+        configs = grid(hidden_sizes, rates, seeds)
+        # the ensemble keeps (networks x hidden x rows) arrays, so all the networks
+        # together get about as many rows as one full-batch network is allowed
+        rows = max(1, FULL_BATCH_ROWS // max(1, len(configs)))
+        if len(data) > rows:
+            self.result_text.insert(tk.END, f"{len(data)} rows is too many to sweep {len(configs)} "
+                                            f"networks at once, using a random {rows} of them\n")
+            data = data.sample(rows)
+        X, y = np.asarray(data.X), np.asarray(data.y)
+        self.result_text.insert(tk.END, f"Sweeping {len(configs)} {gate} networks, {epochs} epochs each...\n")
+        self.result_text.see(tk.END)
+        
+        def work():
+            start = time.perf_counter()
+            try:
+                rows = sweep(configs, X, y, epochs)
+            except Exception as e:
+                rows = e
+            self.sweep_results.put((gate, rows, time.perf_counter() - start))
+        
+        self.sweep_button.config(state=tk.DISABLED)
+        self.sweep_thread = threading.Thread(target=work, daemon=True)
+        self.sweep_thread.start()
+        self.root.after(POLL_MS, self.poll_sweep)
+    
+    def poll_sweep(self):
+        try:
+            gate, rows, seconds = self.sweep_results.get_nowait()
+        except queue.Empty:
+            self.root.after(POLL_MS, self.poll_sweep)
+            return
+        self.sweep_button.config(state=tk.NORMAL)
+        if isinstance(rows, Exception):
+            messagebox.showerror("Error", f"Sweep failed: {rows}")
+            return
+        self.result_text.insert(tk.END, f"Sweep for {gate} done in {seconds:.2f} s, best 10:\n")
+        for row in sorted(rows, key=lambda r: r["final_loss"])[:10]:
+            converged = row["converged_epoch"]
+            self.result_text.insert(tk.END,
+                f"  hidden={row['hidden_size']} lr={row['learning_rate']} seed={row['seed']}: "
+                f"loss {row['final_loss']:.5f}, "
+                f"{f'converged at epoch {converged}' if converged >= 0 else 'did not converge'}\n")
+        self.result_text.see(tk.END)
+    
+    def describe_data(self, gate_word="gate"):
+        # "XOR gate" for the logic gates (gate_word="Gate" for titles), a loaded dataset's own name
+        if self.current_gate in Dataset.GATE_NAMES:
+            return f"{self.current_gate} {gate_word}"
+        return self.current_gate
+    
+    def toggle_pause(self):
+        if not self.training():
+            return
+        if self.worker.paused():
+            self.worker.resume()
+            self.pause_button.config(text="Pause")
+        else:
+            self.worker.pause()
+            self.pause_button.config(text="Resume")
+    
+    def stop_training(self):
+        if self.training():
+            self.worker.stop()
+    
     def test_network(self):
         if self.nn is None:
             messagebox.showerror("Error", "Please train the network first!")
             return
+        if self.training():
+            messagebox.showerror("Error", "Wait for training to finish (or stop it) first!")
+            return
         
-        X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
-        predictions = self.nn.predict(X)
+        data = self.current_data
+        if len(data) > 16:
+            self.test_dataset(data)
+            return
+        X = np.asarray(data.X)
         
         start = time.perf_counter()
+        predictions = self.nn.predict(X)
         elapsed_microseconds = (time.perf_counter() - start) * 1_000_000
         
-        self.result_text.insert(tk.END, f"\nTesting {self.current_gate} gate:\n")
+        self.result_text.insert(tk.END, f"\nTesting {self.describe_data()}:\n")
         for i, (input_pair, prediction) in enumerate(zip(X, predictions)):
             self.result_text.insert(tk.END, f"Input: {input_pair} -> Output: {prediction[0]}\n")
         self.result_text.insert(tk.END, f"\nTesting completed in {elapsed_microseconds:.2f} micro seconds\n")
@@ -161,106 +406,87 @@ class NeuralNetworkGUI:
         # Update decision boundary
         self.plot_decision_boundary()
     
+    def test_dataset(self, data):
+        # too many rows to list, report accuracy instead (a chunk at a time)
+        start = time.perf_counter()
+        correct = 0
+        for first in range(0, len(data), 65536):
+            X, y = data.chunk(first, first + 65536)
+            correct += np.count_nonzero(np.all(self.nn.predict(X) == np.round(y), axis=1))
+        elapsed = time.perf_counter() - start
+        self.result_text.insert(tk.END, f"\nTesting {data.name}: {correct}/{len(data)} correct "
+                                        f"({100 * correct / len(data):.2f}%) in {elapsed:.3f} s\n")
+        self.result_text.see(tk.END)
+        self.plot_decision_boundary()
+    
     def update_plots(self):
-        # Clear previous plot
-        self.ax.clear()
-        
-        # Plot losses
-        self.ax.plot(self.losses, label=f'{self.current_gate} Gate')
-        self.ax.set_title("Training Loss Over Epochs")
-        self.ax.set_xlabel("Epoch")
-        self.ax.set_ylabel("Loss")
-        self.ax.legend()
-        self.ax.grid(True)
-        
-        # Redraw canvas
-        self.canvas.draw()
+        # Only the current run's line changes: its losses get decimated to
+        # the axes width and set on the existing line, older runs stay put
+        self.loss_plot.update(self.losses)
+        self.canvas.draw_idle()
     
-    def plot_decision_boundary(self):
+    def plot_decision_boundary(self, weights=None, key=None):
+        # weights/key: a snapshot of the layers and what identifies it, for
+        # drawing mid-training. Otherwise it's the network's current weights
         if self.nn is None:
             return
-            
+        if weights is None:
+            key = (self.nn, self.nn.version)
+        if key == self.boundary_key:
+            return  # already showing these weights
+        self.boundary_key = key
+        
+        data = self.current_data
+        if data.input_size != 2 or data.output_size != 1:
+            # nothing sensible to draw in 2-D
+            self.ax2.clear()
+            self.boundary_axes = None
+            self.ax2.set_title(f"No decision boundary plot for {data.input_size} inputs")
+            self.canvas2.draw()
+            return
+        X, y = data.chunk(0, PLOT_POINTS)
+        
+        # Create a grid of points around the data
+        if data.name in Dataset.GATE_NAMES:
+            x_min, x_max = -0.5, 1.5
+            y_min, y_max = -0.5, 1.5
+        else:
+            x_min, x_max = X[:, 0].min() - 0.5, X[:, 0].max() + 0.5
+            y_min, y_max = X[:, 1].min() - 0.5, X[:, 1].max() + 0.5
+        
+        # Predict over the grid, only evaluated densely near the 0.5 contour
+        # (see decision_boundary), and not again until the weights change
+        def predict(points):
+            return self.nn.infer(points, layers=weights)[:, 0]
+        xx, yy, Z = self.boundary.get(key, predict, (x_min, x_max), (y_min, y_max))
+        
+        # Same data as last time: only the filled contour changes, clearing
+        # and redoing the whole axes costs more than computing the grid
+        if self.boundary_axes == (data, x_min, x_max, y_min, y_max):
+            self.boundary_contour.remove()
+            self.boundary_contour = self.ax2.contourf(xx, yy, Z, levels=[0, 0.5, 1],
+                                                      cmap=self.cmap, alpha=0.8, zorder=0)
+            self.canvas2.draw_idle()
+            return
+        self.boundary_axes = (data, x_min, x_max, y_min, y_max)
         self.ax2.clear()
         
-        # Create a grid of points
-        x_min, x_max = -0.5, 1.5
-        y_min, y_max = -0.5, 1.5
-        h = 0.01
-        xx, yy = np.meshgrid(np.arange(x_min, x_max, h),
-                             np.arange(y_min, y_max, h))
-        
-        # Predict for each point in the grid
-        Z = self.nn.forward(np.c_[xx.ravel(), yy.ravel()])
-        Z = Z.reshape(xx.shape)
-        
         # Plot decision boundary
-        self.ax2.contourf(xx, yy, Z, levels=[0, 0.5, 1], cmap=plt.cm.Paired, alpha=0.8)
+        self.boundary_contour = self.ax2.contourf(xx, yy, Z, levels=[0, 0.5, 1],
+                                                  cmap=self.cmap, alpha=0.8, zorder=0)
         
         # Plot training points
-        X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
-        if self.current_gate == "AND":
-            y = np.array([0, 0, 0, 1])
-        elif self.current_gate == "OR":
-            y = np.array([0, 1, 1, 1])
-        elif self.current_gate == "XOR":
-            y = np.array([0, 1, 1, 0])
-        
-        self.ax2.scatter(X[:, 0], X[:, 1], c=y, s=100, cmap=plt.cm.Paired, edgecolors='k')
+        self.ax2.scatter(X[:, 0], X[:, 1], c=y[:, 0], s=100 if len(X) <= 16 else 10,
+                         cmap=self.cmap, edgecolors='k')
         
-        self.ax2.set_title(f"{self.current_gate} Gate Decision Boundary")
+        self.ax2.set_title(f"{self.describe_data('Gate')} Decision Boundary")
         self.ax2.set_xlabel("Input 1")
         self.ax2.set_ylabel("Input 2")
-        self.ax2.set_xlim(-0.5, 1.5)
-        self.ax2.set_ylim(-0.5, 1.5)
+        self.ax2.set_xlim(x_min, x_max)
+        self.ax2.set_ylim(y_min, y_max)
         
         self.canvas2.draw()
 
-class NeuralNetwork:
-    def __init__(self, input_size, hidden_size, output_size):
-        # Initialize weights with random values
-        self.weights1 = np.random.randn(input_size, hidden_size)
-        self.weights2 = np.random.randn(hidden_size, output_size)
-        self.bias1 = np.zeros((1, hidden_size))
-        self.bias2 = np.zeros((1, output_size))
-        
-    def sigmoid(self, x):
-        return 1 / (1 + np.exp(-x))
-    
-    def sigmoid_derivative(self, x):
-        return x * (1 - x)
-    
-    def forward(self, X):
-        # Forward propagation
-        self.hidden = self.sigmoid(np.dot(X, self.weights1) + self.bias1)
-        self.output = self.sigmoid(np.dot(self.hidden, self.weights2) + self.bias2)
-        return self.output
-    
-    def backward(self, X, y, output, learning_rate):
-        # Backward propagation
-        error = y - output
-        d_output = error * self.sigmoid_derivative(output)
-        
-        error_hidden = d_output.dot(self.weights2.T)
-        d_hidden = error_hidden * self.sigmoid_derivative(self.hidden)
-        
-        # Update weights and biases
-        self.weights2 += self.hidden.T.dot(d_output) * learning_rate
-        self.bias2 += np.sum(d_output, axis=0, keepdims=True) * learning_rate
-        self.weights1 += X.T.dot(d_hidden) * learning_rate
-        self.bias1 += np.sum(d_hidden, axis=0, keepdims=True) * learning_rate
-    
-    def train(self, X, y, epochs, learning_rate):
-        losses = []
-        for i in range(epochs):
-            output = self.forward(X)
-            self.backward(X, y, output, learning_rate)
-            loss = np.mean(np.square(y - output))
-            losses.append(loss)
-        return losses
-    
-    def predict(self, X):
-        return np.round(self.forward(X))
-
 if __name__ == "__main__":
     root = tk.Tk()
     app = NeuralNetworkGUI(root)
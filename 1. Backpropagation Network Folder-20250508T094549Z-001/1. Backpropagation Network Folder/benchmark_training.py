@@ -0,0 +1,254 @@
+# Benchmarks for NeuralNetwork: forward pass, backward pass and training.
+# For every hidden size / sample count / dtype it times
+#   forward           nn.infer into preallocated buffers
+#   backward          nn.backward alone (forward done outside the timing)
+#   forward+backward  the old one-call-each training loop, as a baseline
+#   train             nn.train, the fused training loop (full batch)
+#   train_batches     nn.train_batches for each batch size smaller than the data
+# and reports passes or epochs per second, samples per second and peak memory
+# (tracemalloc, in a separate untimed run). Results go out as JSON, and
+# --baseline compares against an earlier file and exits 1 on a slowdown.
+#
+# usage:
+#   python benchmark_training.py --hidden 4 16 8,4 --samples 4 1024 --output before.json
+#   python benchmark_training.py --dtypes float32 --batch-sizes 32 256 --baseline before.json
+#   python benchmark_training.py --samples 4096 --profile --line-profile
+import argparse
+import cProfile
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from datasets import Dataset
+from neural_network import NeuralNetwork
+
+RATES = ("passes_per_sec", "epochs_per_sec")  # what --baseline compares
+PROFILE_ROWS = 15
+
+
+def make_data(samples, seed=0):
+    # 4 samples is the XOR gate itself, anything else is random points with XOR labels
+    if samples == 4:
+        return Dataset.gate("XOR")
+    rng = np.random.default_rng(seed)
+    X = rng.random((samples, 2))
+    y = ((X[:, 0] > 0.5) != (X[:, 1] > 0.5)).astype(np.float64)
+    return Dataset(X, y, name=f"xor{samples}")
+
+
+def best_of(repeats, func):
+    # smallest time over a few runs, like benchmark_search. func can return
+    # the seconds to count itself when only part of it should be timed
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        elapsed = func()
+        if elapsed is None:
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(func):
+    # bytes allocated at the peak of one run (numpy arrays included)
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def profile(func):
+    # top functions by cumulative time for one run
+    profiler = cProfile.Profile()
+    profiler.runcall(func)
+    stats = pstats.Stats(profiler)
+    stats.sort_stats("cumulative")
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{os.path.basename(filename)}:{line}({name})", "calls": calls,
+                     "tottime": tottime, "cumtime": cumtime})
+    rows.sort(key=lambda r: r["cumtime"], reverse=True)
+    return rows[:PROFILE_ROWS]
+
+
+def line_profile(nn, X, y, epochs, learning_rate):
+    # line-by-line times for the fused training step (needs line_profiler)
+    try:
+        from line_profiler import LineProfiler
+    except ImportError:
+        print("--line-profile needs line_profiler (pip install line_profiler)", file=sys.stderr)
+        return
+    from optimizers import make_optimizer
+    update = make_optimizer("sgd", learning_rate).bind(nn.layers)
+    load, step, _ = nn._trainer(len(X), update)
+    load(X, y)
+    profiler = LineProfiler(step)
+    profiled = profiler(step)
+    for _ in range(epochs):
+        profiled()
+    profiler.print_stats(stream=sys.stderr)
+
+
+def bench_network(hidden, data, dtype, epochs, batch_sizes, repeats, learning_rate, options):
+    n = len(data)
+    X = np.asarray(data.X, dtype)
+    y = np.asarray(data.y, dtype)
+    base = {"hidden": ",".join(map(str, hidden)), "samples": n, "dtype": np.dtype(dtype).name}
+    rows = []
+
+    def network():
+        # same starting weights for every case
+        np.random.seed(0)
+        return NeuralNetwork(data.input_size, hidden, data.output_size, dtype)
+
+    def add(case, run, passes=None, batch_size=None):
+        # run(nn) does the work being timed (see best_of), passes = forward or
+        # backward calls in it, otherwise it's a training run of `epochs` epochs
+        seconds = best_of(repeats, lambda: run(network()))
+        count = passes or epochs
+        row = dict(base, case=case, batch_size=batch_size or n, seconds=seconds)
+        rate = count / seconds if seconds else None
+        row["passes_per_sec" if passes else "epochs_per_sec"] = rate
+        row["samples_per_sec"] = rate * n if rate else None
+        row["peak_memory"] = peak_memory(lambda: run(network()))
+        if options.profile and not passes:
+            row["profile"] = profile(lambda: run(network()))
+            print(f"\n{case} hidden={base['hidden']} n={n} {base['dtype']} batch={row['batch_size']}:",
+                  file=sys.stderr)
+            for p in row["profile"]:
+                print(f"  {p['cumtime'] * 1000:10.2f} ms {p['calls']:>8}  {p['function']}",
+                      file=sys.stderr)
+        rows.append(row)
+
+    def forward(nn):
+        buffers = nn.inference_buffers(n)
+        for _ in range(epochs):
+            nn.infer(X, buffers)
+
+    def train(nn):
+        nn.train(X, y, epochs, learning_rate)
+
+    def backward(nn):
+        # the forward pass each backward() needs is left out of the time
+        total = 0.0
+        for _ in range(epochs):
+            output = nn.forward(X)
+            start = time.perf_counter()
+            nn.backward(X, y, output, learning_rate)
+            total += time.perf_counter() - start
+        return total
+
+    def forward_backward(nn):
+        for _ in range(epochs):
+            nn.backward(X, y, nn.forward(X), learning_rate)
+
+    def train_batches(nn, batch_size):
+        nn.train_batches(data, epochs, learning_rate, batch_size, seed=0)
+
+    add("forward", forward, passes=epochs)
+    add("backward", backward, passes=epochs)
+    add("forward+backward", forward_backward)
+    add("train", train)
+    for batch_size in batch_sizes:
+        if 0 < batch_size < n:
+            add("train_batches", lambda nn, b=batch_size: train_batches(nn, b),
+                batch_size=batch_size)
+    if options.line_profile:
+        print(f"\nfused step hidden={base['hidden']} n={n} {base['dtype']}:", file=sys.stderr)
+        line_profile(network(), X, y, epochs, learning_rate)
+    return rows
+
+
+def compare(rows, baseline_path, tolerance):
+    # rows slower than the baseline by more than tolerance (0.1 = 10%)
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+
+    def key(row):
+        return row["case"], row["hidden"], row["samples"], row["batch_size"], row["dtype"]
+
+    before = {key(row): row for row in baseline}
+    slower = []
+    for row in rows:
+        old = before.get(key(row))
+        if old is None:
+            continue
+        for rate in RATES:
+            if row.get(rate) and old.get(rate) and row[rate] < old[rate] * (1 - tolerance):
+                slower.append((row, rate, old[rate]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark NeuralNetwork training")
+    parser.add_argument("--hidden", nargs="+", default=["4", "16", "64", "8,4"],
+                        help="hidden layer sizes, comma separated for several layers")
+    parser.add_argument("--samples", nargs="+", type=int, default=[4, 1024, 16384],
+                        help="training set sizes, 4 = the XOR gate")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[32, 256],
+                        help="mini-batch sizes for train_batches (full batch is always run)")
+    parser.add_argument("--dtypes", nargs="+", choices=["float64", "float32"],
+                        default=["float64", "float32"])
+    parser.add_argument("--epochs", type=int, default=1000)
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--profile", action="store_true", help="cProfile every training case")
+    parser.add_argument("--line-profile", action="store_true",
+                        help="line-by-line times of the fused step (needs line_profiler)")
+    parser.add_argument("--baseline", help="earlier JSON output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed slowdown against --baseline (0.1 = 10%%)")
+    parser.add_argument("-o", "--output", default="-", help="JSON file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for samples in args.samples:
+        data = make_data(samples)
+        for hidden in args.hidden:
+            sizes = [int(v) for v in hidden.split(",")]
+            for dtype in args.dtypes:
+                for row in bench_network(sizes, data, dtype, args.epochs, args.batch_sizes,
+                                         args.repeats, args.learning_rate, args):
+                    rows.append(row)
+                    rate = row.get("epochs_per_sec") or row.get("passes_per_sec")
+                    unit = "epochs/s" if "epochs_per_sec" in row else "passes/s"
+                    print(f"{row['case']:>16} hidden={row['hidden']:<6} n={row['samples']:<7} "
+                          f"batch={row['batch_size']:<7} {row['dtype']:<8} {rate:12.1f} {unit} "
+                          f"{row['samples_per_sec']:14.0f} samples/s "
+                          f"{row['peak_memory'] / 1024:10.1f} KiB", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "args": vars(args),
+        "results": rows,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        slower = compare(rows, args.baseline, args.tolerance)
+        for row, rate, old in slower:
+            print(f"SLOWER: {row['case']} hidden={row['hidden']} n={row['samples']} "
+                  f"batch={row['batch_size']} {row['dtype']}: {rate} {old:.1f} -> {row[rate]:.1f}",
+                  file=sys.stderr)
+        if slower:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# Regression check: adaptive_grid has to classify every grid point the same
+# way as running infer on the full grid. Uses random networks (one and two
+# hidden layers, weights scaled up so the boundaries get curvy), a trained
+# XOR network, and both the gate plot bounds and wider ones. Also checks
+# infer against forward and BoundaryCache reuse.
+#
+# usage:
+#   python check_decision_boundary.py             # exits 1 on the first mismatch
+#   python check_decision_boundary.py --networks 200 --seed 3
+import argparse
+import sys
+
+import numpy as np
+
+from datasets import Dataset
+from decision_boundary import BoundaryCache, adaptive_grid
+from neural_network import NeuralNetwork
+
+RANGES = ((-0.5, 1.5), (-3.0, 3.0))
+
+
+def networks(count, seed):
+    # (description, network) pairs
+    np.random.seed(seed)
+    for k in range(count):
+        hidden = [8] if k % 2 else [16, 16]
+        nn = NeuralNetwork(2, hidden, 1)
+        for layer in nn.layers:
+            layer *= 1 + 4 * np.random.rand()
+        yield f"random {hidden} #{k}", nn
+    gate = Dataset.gate("XOR")
+    nn = NeuralNetwork(2, 4, 1)
+    nn.train(gate.X, gate.y, 5000, 1.0)
+    yield "trained XOR", nn
+
+
+def check(count, seed):
+    for name, nn in networks(count, seed):
+        points = np.random.rand(500, 2) * 4 - 2
+        if not np.allclose(nn.infer(points), nn.forward(points)):
+            return f"{name}: infer differs from forward"
+        def predict(points, nn=nn):
+            return nn.infer(points)[:, 0]
+        for bounds in RANGES:
+            xx, yy, Z, evaluated = adaptive_grid(predict, bounds, bounds)
+            full = predict(np.column_stack((xx.ravel(), yy.ravel()))).reshape(xx.shape)
+            wrong = np.count_nonzero((Z > 0.5) != (full > 0.5))
+            if wrong:
+                return f"{name} over {bounds}: {wrong} of {Z.size} grid points classified differently"
+            if evaluated > Z.size:
+                return f"{name} over {bounds}: evaluated {evaluated} points, more than the grid"
+        cache = BoundaryCache()
+        first = cache.get((nn, nn.version), predict, RANGES[0], RANGES[0])
+        if cache.get((nn, nn.version), predict, RANGES[0], RANGES[0]) is not first:
+            return f"{name}: BoundaryCache recomputed for the same key"
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check adaptive_grid against the full grid")
+    parser.add_argument("--networks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    problem = check(args.networks, args.seed)
+    if problem:
+        print(f"FAIL: {problem}", file=sys.stderr)
+        return 1
+    print(f"ok: {args.networks + 1} networks x {len(RANGES)} plot ranges")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# Training data that doesn't have to be the four logic gate rows.
+# Big datasets stay on disk: .npy files are opened with np.load(mmap_mode='r')
+# and CSV files get converted to a .npy next to them once (read in chunks,
+# never all at once), so only the rows being trained on are ever in memory.
+#
+# batches() feeds mini-batches to NeuralNetwork.train_batches: it reads the
+# data a chunk of rows at a time on a background thread (so the next chunk
+# loads while the current one trains), shuffles the chunk order and the rows
+# inside each chunk, and cuts the chunks into batches.
+import os
+import queue
+import threading
+
+import numpy as np
+
+GATES = {
+    "AND": [0, 0, 0, 1],
+    "OR": [0, 1, 1, 1],
+    "XOR": [0, 1, 1, 0],
+}
+
+CSV_CHUNK_ROWS = 65536  # rows parsed per step when converting a CSV
+
+
+class Dataset:
+    GATE_NAMES = tuple(GATES)
+
+    def __init__(self, X, y, name=""):
+        # X is samples x inputs, y is samples x outputs (either can be a memmap)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if y.ndim == 1:
+            y = y.reshape(-1, 1)
+        if len(X) != len(y):
+            raise ValueError(f"{len(X)} input rows but {len(y)} target rows")
+        self.X = X
+        self.y = y
+        self.name = name
+
+    def __len__(self):
+        return len(self.X)
+
+    @property
+    def input_size(self):
+        return self.X.shape[1]
+
+    @property
+    def output_size(self):
+        return self.y.shape[1]
+
+    @classmethod
+    def gate(cls, gate):
+        X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+        y = np.array(GATES[gate]).reshape(-1, 1)
+        return cls(X, y, name=gate)
+
+    @classmethod
+    def load(cls, path, targets=1):
+        # the last `targets` columns are the outputs, everything before them the inputs
+        path = str(path)
+        if not path.endswith(".npy"):
+            path = csv_to_npy(path)
+        data = np.load(path, mmap_mode='r')
+        if data.ndim != 2 or data.shape[1] <= targets:
+            raise ValueError(f"{path}: need a 2-D array with more than {targets} columns")
+        return cls(data[:, :-targets], data[:, -targets:], name=os.path.basename(path))
+
+    def chunk(self, start, stop):
+        # rows start..stop as ordinary in-memory arrays
+        return np.asarray(self.X[start:stop], np.float64), np.asarray(self.y[start:stop], np.float64)
+
+    def sample(self, rows, seed=0):
+        # `rows` random rows as an in-memory Dataset, read in file order
+        picked = np.sort(np.random.default_rng(seed).choice(len(self), rows, replace=False))
+        return Dataset(np.asarray(self.X[picked], np.float64), np.asarray(self.y[picked], np.float64),
+                       name=self.name)
+
+
+def _is_header(line, delimiter):
+    try:
+        [float(v) for v in line.split(delimiter)]
+    except ValueError:
+        return True
+    return False
+
+
+def csv_to_npy(path, out_path=None, delimiter=','):
+    # converts a numeric CSV to .npy without loading the whole file, and
+    # reuses the .npy from last time if the CSV hasn't changed since
+    out_path = out_path or path + ".npy"
+    if os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(path):
+        return out_path
+    # first pass: count rows and columns
+    rows = 0
+    columns = None
+    skip = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if columns is None:
+                columns = len(line.split(delimiter))
+                if _is_header(line, delimiter):
+                    skip = 1
+                    continue
+            rows += 1
+    if columns is None:
+        raise ValueError(f"{path} is empty")
+    # second pass: parse a chunk of lines at a time straight into the .npy
+    # (written under a temporary name, so a failed conversion isn't reused next time)
+    temp_path = out_path + ".tmp"
+    out = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float64, shape=(rows, columns))
+    with open(path, encoding="utf-8") as f:
+        lines = (line for line in f if line.strip())
+        for _ in range(skip):
+            next(lines)
+        start = 0
+        while start < rows:
+            chunk = [next(lines) for _ in range(min(CSV_CHUNK_ROWS, rows - start))]
+            out[start:start + len(chunk)] = np.loadtxt(chunk, delimiter=delimiter, ndmin=2)
+            start += len(chunk)
+    out.flush()
+    del out
+    os.replace(temp_path, out_path)
+    return out_path
+
+
+def batches(dataset, batch_size, shuffle=True, rng=None, chunk_rows=None, prefetch=2):
+    # yields (X, y) mini-batches covering the dataset once (one epoch)
+    n = len(dataset)
+    # whole batches per chunk, so only the very last batch can come out short
+    chunk_rows = chunk_rows or batch_size * max(64, -(-4096 // batch_size))
+    starts = np.arange(0, n, chunk_rows)
+    if shuffle:
+        rng = rng if rng is not None else np.random.default_rng()
+        starts = rng.permutation(starts)
+
+    chunks = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def reader():
+        try:
+            for start in starts:
+                if stop.is_set():
+                    return
+                chunks.put(dataset.chunk(start, min(start + chunk_rows, n)))
+        except Exception as e:  # handed to the consumer, or it would wait forever
+            chunks.put(e)
+            return
+        chunks.put(None)
+
+    threading.Thread(target=reader, daemon=True).start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            X, y = chunk
+            if shuffle:
+                order = rng.permutation(len(X))
+                X, y = X[order], y[order]
+            for i in range(0, len(X), batch_size):
+                yield X[i:i + batch_size], y[i:i + batch_size]
+    finally:
+        # if the caller quit early, unblock the reader so it can notice the stop
+        stop.set()
+        while not chunks.empty():
+            chunks.get_nowait()
@@ -0,0 +1,102 @@
+# Decision boundary grid for 2-input networks, without evaluating every point.
+# Starts from a coarse grid and only refines the cells the 0.5 contour could
+# pass through: corners on different sides, or corners on one side but close
+# enough to 0.5 (within the spread of the corner values) that a thin sliver
+# could hide between them, plus a one-cell margin around both. Everything
+# else gets filled in by interpolating its corners, which can't cross 0.5 when
+# all the corners are on the same side. So the cost follows the length of the
+# boundary instead of the area of the plot.
+#
+# BoundaryCache keeps the last grid, keyed on whatever identifies the
+# weights (e.g. (network id, network.version)), so pressing Test Network
+# again without retraining doesn't recompute anything.
+import numpy as np
+
+FINE_SIZE = 257  # points per side of the final grid (2^k + 1)
+COARSE_SIZE = 17  # points per side of the first pass (2^j + 1, j <= k)
+
+
+def _refine_mask(cells):
+    # cells the contour could be in, grown by one cell all around so a
+    # boundary that sneaks between two corners still gets caught
+    grown = cells.copy()
+    grown[1:] |= cells[:-1]
+    grown[:-1] |= cells[1:]
+    grown[:, 1:] |= grown[:, :-1].copy()
+    grown[:, :-1] |= grown[:, 1:].copy()
+    return grown
+
+
+def adaptive_grid(predict, x_range, y_range, size=FINE_SIZE, coarse=COARSE_SIZE):
+    # predict(points) -> output for each (x, y) row of points, values in [0, 1]
+    # returns (xx, yy, Z, evaluated) where evaluated is how many points predict saw
+    xs = np.linspace(x_range[0], x_range[1], size)
+    ys = np.linspace(y_range[0], y_range[1], size)
+    Z = np.empty((size, size))
+    step = (size - 1) // (coarse - 1)
+    evaluated = 0
+
+    def evaluate(rows, cols):
+        nonlocal evaluated
+        evaluated += len(rows)
+        return predict(np.column_stack((xs[cols], ys[rows])))
+
+    rows, cols = np.mgrid[0:size:step, 0:size:step]
+    Z[0:size:step, 0:size:step] = evaluate(rows.ravel(), cols.ravel()).reshape(rows.shape)
+
+    while step > 1:
+        half = step // 2
+        known = Z[::step, ::step]
+        side = known > 0.5
+        mixed = ((side[:-1, :-1] != side[1:, :-1]) | (side[:-1, :-1] != side[:-1, 1:])
+                 | (side[:-1, :-1] != side[1:, 1:]))
+        corners = (known[:-1, :-1], known[1:, :-1], known[:-1, 1:], known[1:, 1:])
+        low, high = np.minimum.reduce(corners), np.maximum.reduce(corners)
+        spread = high - low
+        near = (low - spread <= 0.5) & (high + spread >= 0.5)
+        refine = _refine_mask(mixed | near)
+        cells = len(refine)
+        # padded so edge points can look at the cells on both sides
+        padded = np.zeros((cells + 2, cells + 2), bool)
+        padded[1:-1, 1:-1] = refine
+
+        # level grid at the new spacing: even/even points are already known
+        level = Z[::half, ::half]
+        a, b = np.arange(cells), np.arange(cells + 1)
+        # cell centers, edge midpoints between two rows, and between two columns
+        centers = (np.add.outer(2 * a + 1, 0 * a), np.add.outer(0 * a, 2 * a + 1), refine,
+                   lambda r, c: (level[r - 1, c - 1] + level[r - 1, c + 1]
+                                 + level[r + 1, c - 1] + level[r + 1, c + 1]) / 4)
+        row_edges = (np.add.outer(2 * a + 1, 0 * b), np.add.outer(0 * a, 2 * b),
+                     padded[1:-1, :-1] | padded[1:-1, 1:],
+                     lambda r, c: (level[r - 1, c] + level[r + 1, c]) / 2)
+        col_edges = (np.add.outer(2 * b, 0 * a), np.add.outer(0 * b, 2 * a + 1),
+                     padded[:-1, 1:-1] | padded[1:, 1:-1],
+                     lambda r, c: (level[r, c - 1] + level[r, c + 1]) / 2)
+        # edges first: centers interpolate from corners only, so order doesn't matter
+        for r, c, exact, interpolate in (row_edges, col_edges, centers):
+            r_fine, c_fine = r * half, c * half
+            level[r[exact], c[exact]] = evaluate(r_fine[exact], c_fine[exact])
+            rest = ~exact
+            level[r[rest], c[rest]] = interpolate(r[rest], c[rest])
+        step = half
+
+    xx, yy = np.meshgrid(xs, ys)
+    return xx, yy, Z, evaluated
+
+
+class BoundaryCache:
+    def __init__(self, size=FINE_SIZE, coarse=COARSE_SIZE):
+        self.size = size
+        self.coarse = coarse
+        self.key = None
+        self.result = None
+
+    def get(self, key, predict, x_range, y_range):
+        # (xx, yy, Z) for these weights, only computed if key or the ranges changed
+        full_key = (key, tuple(x_range), tuple(y_range))
+        if full_key != self.key:
+            xx, yy, Z, _ = adaptive_grid(predict, x_range, y_range, self.size, self.coarse)
+            self.key = full_key
+            self.result = (xx, yy, Z)
+        return self.result
@@ -0,0 +1,188 @@
+# Trains lots of small networks at once for hyperparameter sweeps.
+# Instead of one NeuralNetwork per seed / hidden size / learning rate, all N
+# networks get stacked into 3-D weight tensors and every epoch is one batched
+# matmul over the whole stack. Networks with fewer hidden units are padded up
+# to the biggest one, and the padding units are masked to 0 so they never
+# affect the output or get any gradient.
+#
+# Same math as NeuralNetwork.train (one hidden layer, sigmoid, MSE, plain
+# gradient descent), and a config with seed s starts from the same weights
+# as NeuralNetwork after np.random.seed(s).
+#
+# usage:
+#   python ensemble_training.py --gate XOR --hidden 2 4 8 --rates 0.1 0.5 1 --seeds 10
+#   python ensemble_training.py --processes 4 --output sweep.json
+import argparse
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from datasets import GATES, Dataset
+
+
+class Ensemble:
+    def __init__(self, configs, input_size, output_size, dtype=np.float64):
+        # configs: list of {"hidden_size", "learning_rate", "seed"} dicts
+        self.configs = [dict(c) for c in configs]
+        self.dtype = np.dtype(dtype)
+        count = len(self.configs)
+        hidden_max = max(c["hidden_size"] for c in self.configs)
+        # layer matrices are (outputs x inputs + 1) with the bias as last column,
+        # same layout as NeuralNetwork.layer1 / layer2, one per network
+        self.layer1 = np.zeros((count, hidden_max, input_size + 1), self.dtype)
+        self.layer2 = np.zeros((count, output_size, hidden_max + 1), self.dtype)
+        self.hidden_mask = np.zeros((count, hidden_max, 1), self.dtype)  # 1 = real unit
+        self.rates = np.zeros((count, 1, 1), self.dtype)
+        for k, config in enumerate(self.configs):
+            hidden = config["hidden_size"]
+            rng = np.random.RandomState(config.get("seed"))
+            self.layer1[k, :hidden, :input_size] = rng.randn(input_size, hidden).T
+            self.layer2[k, :, :hidden] = rng.randn(hidden, output_size).T
+            self.hidden_mask[k, :hidden] = 1
+            self.rates[k] = config["learning_rate"]
+
+    def train(self, X, y, epochs, record_every=1, target_loss=None):
+        # trains every network for the same number of epochs
+        # returns losses as a (networks x recorded epochs) array, plus how many
+        # epochs each network took to get its loss down to target_loss (-1 = never),
+        # counted like NeuralNetwork.converged_epoch
+        dtype = self.dtype
+        count, hidden_max, _ = self.layer1.shape
+        n = len(X)
+        inputs = np.ones((n, np.shape(X)[1] + 1), dtype)
+        inputs[:, :-1] = X
+        inputs_t = np.ascontiguousarray(inputs.T)
+        y_t = np.ascontiguousarray(np.asarray(y, dtype).T)
+        layer1, layer2 = self.layer1, self.layer2
+        weights2_t = layer2[:, :, :hidden_max].transpose(0, 2, 1)
+        mask, rates = self.hidden_mask, self.rates
+
+        hidden_ones = np.ones((count, hidden_max + 1, n), dtype)
+        hidden = hidden_ones[:, :hidden_max]
+        output = np.empty((count,) + y_t.shape, dtype)
+        error = np.empty_like(output)
+        d_output = np.empty_like(output)
+        d_hidden = np.empty_like(hidden)
+        slope = np.empty_like(hidden)
+        grad1 = np.empty_like(layer1)
+        grad2 = np.empty_like(layer2)
+        half = np.array(0.5, dtype)
+        matmul, multiply, subtract, tanh = np.matmul, np.multiply, np.subtract, np.tanh
+
+        losses = np.empty((count, (epochs + record_every - 1) // record_every), dtype)
+        converged = np.full(count, -1)
+        for epoch in range(epochs):
+            # forward, sigmoid as 0.5 + 0.5 * tanh(x / 2) like NeuralNetwork
+            matmul(layer1, inputs_t, hidden)
+            multiply(hidden, half, hidden)
+            tanh(hidden, hidden)
+            multiply(hidden, half, hidden)
+            hidden += half
+            hidden *= mask  # padding units output 0, so they get no gradient either
+            matmul(layer2, hidden_ones, output)
+            multiply(output, half, output)
+            tanh(output, output)
+            multiply(output, half, output)
+            output += half
+            subtract(y_t, output, error)
+            if epoch % record_every == 0:
+                column = epoch // record_every
+                np.einsum('kij,kij->k', error, error, out=losses[:, column])
+                losses[:, column] /= y_t.size
+                if target_loss is not None:
+                    converged[(converged < 0) & (losses[:, column] <= target_loss)] = epoch + 1
+
+            # backward, each network with its own learning rate
+            multiply(output, output, d_output)
+            subtract(output, d_output, d_output)
+            d_output *= error
+            d_output *= rates
+            matmul(weights2_t, d_output, d_hidden)
+            multiply(hidden, hidden, slope)
+            subtract(hidden, slope, slope)
+            d_hidden *= slope
+
+            matmul(d_output, hidden_ones.transpose(0, 2, 1), grad2)
+            layer2 += grad2
+            matmul(d_hidden, inputs, grad1)
+            layer1 += grad1
+        return losses, converged
+
+    def results(self, losses, converged):
+        rows = []
+        for k, config in enumerate(self.configs):
+            rows.append(dict(config, final_loss=float(losses[k, -1]),
+                             converged_epoch=int(converged[k])))
+        return rows
+
+
+def _train_shard(args):
+    configs, X, y, epochs, target_loss, dtype = args
+    ensemble = Ensemble(configs, np.shape(X)[1], np.shape(y)[1], dtype)
+    losses, converged = ensemble.train(X, y, epochs, record_every=1, target_loss=target_loss)
+    return ensemble.results(losses, converged)
+
+
+def sweep(configs, X, y, epochs, target_loss=0.01, processes=1, dtype=np.float64):
+    # trains every config, split over processes shards if processes > 1
+    # returns one result dict per config, in the same order
+    configs = list(configs)
+    if processes <= 1 or len(configs) < 2:
+        return _train_shard((configs, X, y, epochs, target_loss, dtype))
+    shards = [configs[i::processes] for i in range(processes)]
+    shards = [shard for shard in shards if shard]
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        parts = list(pool.map(_train_shard, [(shard, X, y, epochs, target_loss, dtype)
+                                             for shard in shards]))
+    # undo the round-robin split
+    rows = [None] * len(configs)
+    for i, part in enumerate(parts):
+        rows[i::len(shards)] = part
+    return rows
+
+
+def grid(hidden_sizes, learning_rates, seeds):
+    return [{"hidden_size": h, "learning_rate": lr, "seed": s}
+            for h, lr, s in itertools.product(hidden_sizes, learning_rates, seeds)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train a grid of networks in one batched pass")
+    parser.add_argument("--gate", choices=sorted(GATES), default="XOR")
+    parser.add_argument("--hidden", nargs="+", type=int, default=[2, 4, 8])
+    parser.add_argument("--rates", nargs="+", type=float, default=[0.1, 0.5, 1.0])
+    parser.add_argument("--seeds", type=int, default=10, help="seeds 0..N-1 for every combination")
+    parser.add_argument("--epochs", type=int, default=10000)
+    parser.add_argument("--target", type=float, default=0.01, help="loss that counts as converged")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--float32", action="store_true")
+    parser.add_argument("-o", "--output", default="-", help="JSON file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    data = Dataset.gate(args.gate)
+    X, y = data.X, data.y
+    configs = grid(args.hidden, args.rates, range(args.seeds))
+    start = time.perf_counter()
+    rows = sweep(configs, X, y, args.epochs, args.target, args.processes,
+                 np.float32 if args.float32 else np.float64)
+    seconds = time.perf_counter() - start
+    print(f"{len(rows)} networks x {args.epochs} epochs in {seconds:.2f} s", file=sys.stderr)
+    for row in sorted(rows, key=lambda r: r["final_loss"])[:10]:
+        print(f"hidden={row['hidden_size']:<3} lr={row['learning_rate']:<5} seed={row['seed']:<3} "
+              f"loss={row['final_loss']:.5f} converged at {row['converged_epoch']}", file=sys.stderr)
+
+    text = json.dumps({"gate": args.gate, "epochs": args.epochs, "seconds": seconds,
+                       "results": rows}, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
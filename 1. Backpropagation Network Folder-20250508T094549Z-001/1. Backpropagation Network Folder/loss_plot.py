@@ -0,0 +1,79 @@
+# Loss curves that stay cheap to redraw while training.
+# Each run's losses go into a growable numpy buffer (doubles when full), and
+# its line never gets more than about two points per pixel of axes width:
+# the min and max of each pixel's slice of epochs, so spikes still show.
+# The Line2D is updated in place with set_data instead of clearing the
+# axes, and earlier runs stay on the plot (faded) to compare against.
+import numpy as np
+
+MAX_RUNS = 5  # runs kept on the plot, the oldest one goes first
+OLD_RUN_ALPHA = 0.35
+
+
+def decimate(values, width):
+    # returns (x, y) with at most 2 * width points that look the same as
+    # values when drawn width pixels wide
+    n = len(values)
+    if n <= 2 * width:
+        return np.arange(n), values
+    edges = np.linspace(0, n, width + 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:] - 1
+    lows = np.minimum.reduceat(values, starts)
+    highs = np.maximum.reduceat(values, starts)
+    # min first where the loss is going down inside the bucket, max first
+    # where it's going up, so the line doesn't zigzag between buckets
+    falling = values[starts] > values[ends]
+    x = np.empty(2 * width, np.int64)
+    y = np.empty(2 * width, values.dtype)
+    x[0::2], x[1::2] = starts, ends
+    y[0::2] = np.where(falling, highs, lows)
+    y[1::2] = np.where(falling, lows, highs)
+    return x, y
+
+
+class LossCurve:
+    def __init__(self, line, capacity=1024):
+        self.line = line
+        self.values = np.empty(capacity)
+        self.size = 0
+
+    def extend(self, losses):
+        # losses is the whole run so far (what train() hands to progress),
+        # only the part we haven't seen yet gets copied
+        new = np.asarray(losses[self.size:], np.float64)
+        needed = self.size + len(new)
+        if needed > len(self.values):
+            grown = np.empty(max(needed, 2 * len(self.values)))
+            grown[:self.size] = self.values[:self.size]
+            self.values = grown
+        self.values[self.size:needed] = new
+        self.size = needed
+
+    def redraw(self, width):
+        self.line.set_data(*decimate(self.values[:self.size], width))
+
+
+class LossPlot:
+    def __init__(self, ax, max_runs=MAX_RUNS):
+        self.ax = ax
+        self.max_runs = max_runs
+        self.runs = []
+
+    def new_run(self, label):
+        for run in self.runs:
+            run.line.set_alpha(OLD_RUN_ALPHA)
+        if len(self.runs) >= self.max_runs:
+            self.runs.pop(0).line.remove()
+        line, = self.ax.plot([], [], label=label)
+        self.runs.append(LossCurve(line))
+        self.ax.legend(loc="upper right")
+
+    def update(self, losses):
+        # new losses for the current run, the caller redraws the canvas
+        if not self.runs:
+            return
+        run = self.runs[-1]
+        run.extend(losses)
+        run.redraw(max(int(self.ax.bbox.width), 1))
+        self.ax.relim()
+        self.ax.autoscale_view()
@@ -0,0 +1,363 @@
+# The network itself and its background trainer, with no GUI in sight:
+# only numpy and the standard library get imported, so scripts, sweeps and
+# benchmarks can use NeuralNetwork without tkinter, matplotlib or a display.
+# backpropagation_neural_network.py is the Tk app on top of this.
+import queue
+import threading
+import time
+
+import numpy as np
+
+from datasets import batches
+from optimizers import make_optimizer
+
+# full-batch training copies all of X into memory, so bigger datasets
+# (which may be memory-mapped files) get mini-batches instead
+FULL_BATCH_ROWS = 65536
+DEFAULT_BATCH_SIZE = 256
+
+def _sigmoid(x, out):
+    # 1 / (1 + e^-x) written as 0.5 + 0.5 * tanh(x / 2), same curve but
+    # exp() can't overflow for big negative x. Works in place into out
+    np.multiply(x, 0.5, out=out)
+    np.tanh(out, out=out)
+    out *= 0.5
+    out += 0.5
+    return out
+
+class EarlyStopping:
+    # decides when a run has converged: the loss got under target_loss, or it
+    # hasn't improved by more than min_delta for patience epochs in a row
+    def __init__(self, target_loss=None, patience=None, min_delta=1e-6):
+        self.target_loss = target_loss
+        self.patience = patience
+        self.min_delta = min_delta
+        self.best = np.inf
+        self.best_epoch = 0
+        self.reason = None  # "target" or "plateau" once it says stop
+    
+    def active(self):
+        return self.target_loss is not None or self.patience is not None
+    
+    def check(self, epoch, loss):
+        # returns True when training should stop after this epoch
+        if self.target_loss is not None and loss <= self.target_loss:
+            self.reason = "target"
+            return True
+        if loss < self.best - self.min_delta:
+            self.best = loss
+            self.best_epoch = epoch
+        elif self.patience is not None and epoch - self.best_epoch >= self.patience:
+            self.reason = "plateau"
+            return True
+        return False
+
+class NeuralNetwork:
+    def __init__(self, input_size, hidden_size, output_size, dtype=np.float64):
+        # hidden_size is one layer's size, or a list of sizes for several hidden layers
+        self.dtype = np.dtype(dtype)
+        hidden_sizes = list(hidden_size) if np.iterable(hidden_size) else [hidden_size]
+        sizes = [input_size] + hidden_sizes + [output_size]
+        # Each layer is stored as one (outputs x inputs + 1) matrix with the
+        # bias as its last column, so training can update weights and bias
+        # with a single product. weights1/bias1, weights2/bias2, ... are views
+        # into these (layer1, layer2, ...) for the old one-hidden-layer code
+        self.layers = []
+        self.weights = []
+        self.biases = []
+        for i, (fan_in, fan_out) in enumerate(zip(sizes, sizes[1:]), 1):
+            layer = np.zeros((fan_out, fan_in + 1), self.dtype)
+            weights, bias = layer[:, :fan_in].T, layer[:, fan_in:].T
+            # Initialize weights with random values (biases start at zero)
+            weights[...] = np.random.randn(fan_in, fan_out)
+            self.layers.append(layer)
+            self.weights.append(weights)
+            self.biases.append(bias)
+            setattr(self, f"layer{i}", layer)
+            setattr(self, f"weights{i}", weights)
+            setattr(self, f"bias{i}", bias)
+        self.epochs_run = 0  # set by train(), less than asked for if it stopped early
+        self.converged_epoch = None  # epoch the loss got under target_loss, if it did
+        self.version = 0  # goes up whenever training changes the weights
+        
+    def sigmoid(self, x):
+        return _sigmoid(x, np.empty(np.shape(x), self.dtype))
+    
+    def sigmoid_derivative(self, x):
+        return x * (1 - x)
+    
+    def forward(self, X):
+        # Forward propagation, keeps every layer's activations for backward()
+        self.activations = [X]
+        for weights, bias in zip(self.weights, self.biases):
+            self.activations.append(self.sigmoid(np.dot(self.activations[-1], weights) + bias))
+        self.hidden = self.activations[1]
+        self.output = self.activations[-1]
+        return self.output
+    
+    def infer(self, X, buffers=None, layers=None):
+        # Forward pass without side effects: self.activations / hidden / output
+        # are left alone, so it's safe while another thread trains. layers can
+        # be a snapshot (like TrainingWorker's progress weights) instead of
+        # self.layers. buffers from inference_buffers(len(X)) get every layer's
+        # output written into them, so repeated calls don't allocate.
+        # Returns the output (the last buffer)
+        layers = self.layers if layers is None else layers
+        if buffers is None:
+            buffers = self.inference_buffers(len(X), layers)
+        below = np.asarray(X, layers[0].dtype)
+        for layer, out in zip(layers, buffers):
+            np.dot(below, layer[:, :-1].T, out=out)
+            np.add(out, layer[:, -1], out=out)
+            _sigmoid(out, out)
+            below = out
+        return below
+    
+    def inference_buffers(self, n, layers=None):
+        layers = self.layers if layers is None else layers
+        return [np.empty((n, layer.shape[0]), layer.dtype) for layer in layers]
+    
+    def backward(self, X, y, output, learning_rate):
+        # Backward propagation (plain gradient descent)
+        self.version += 1
+        d_layer = (y - output) * self.sigmoid_derivative(output)
+        for i in reversed(range(len(self.weights))):
+            below = self.activations[i]
+            # error for the layer below, before this layer's weights change
+            d_below = d_layer.dot(self.weights[i].T) * self.sigmoid_derivative(below) if i else None
+            
+            # Update weights and biases
+            self.weights[i] += below.T.dot(d_layer) * learning_rate
+            self.biases[i] += np.sum(d_layer, axis=0, keepdims=True) * learning_rate
+            d_layer = d_below
+    
+    def _trainer(self, n, update):
+        # Same math as forward() + backward(), fused into one step over
+        # buffers for n samples that are allocated once up front, so a step
+        # itself never allocates. Everything is kept transposed (one column
+        # per sample) so each layer's activations are one contiguous block,
+        # with a row of ones under them for the bias column of the next layer.
+        # update(grads) applies the gradients, see optimizers.
+        # Returns load(X, y) to copy a batch in, step() to train on it once,
+        # and the error buffer step() leaves behind (y - output before the update)
+        dtype = self.dtype
+        layers = self.layers
+        # activations[0] is the input, with ones under every layer but the output
+        activations = [np.ones((layer.shape[1], n), dtype) for layer in layers]
+        activations.append(np.empty((layers[-1].shape[0], n), dtype))
+        outputs = [a[:layer.shape[0]] for a, layer in zip(activations[1:], layers)]
+        inputs_t, output = activations[0], activations[-1]
+        below_t = [a.T for a in activations[:-1]]  # samples as rows, for the gradients
+        weights_t = [layer[:, :-1].T for layer in layers]  # for sending errors back
+        y_t = np.empty_like(output)
+        error = np.empty_like(output)
+        deltas = [np.empty_like(a) for a in outputs]
+        slopes = [np.empty_like(a) for a in outputs[:-1]]
+        grads = [np.empty_like(layer) for layer in layers]
+        half = np.array(0.5, dtype)
+        top = len(layers) - 1
+        
+        # the arrays are tiny for the gates, so the per-call overhead is what counts
+        dot, add, multiply, subtract, tanh = np.dot, np.add, np.multiply, np.subtract, np.tanh
+        
+        def load(X, y):
+            inputs_t[:-1] = X.T
+            y_t[...] = np.reshape(y, (n, -1)).T
+        
+        def step():
+            # forward, sigmoid done inline like _sigmoid
+            for layer, below, out in zip(layers, activations, outputs):
+                dot(layer, below, out)
+                multiply(out, half, out)
+                tanh(out, out)
+                multiply(out, half, out)
+                add(out, half, out)
+            subtract(y_t, output, error)
+            
+            # backward: delta = error * output * (1 - output) at the top,
+            # then sent down through each layer's weights
+            delta = deltas[top]
+            multiply(output, output, delta)
+            subtract(output, delta, delta)
+            multiply(delta, error, delta)
+            for i in range(top, -1, -1):
+                dot(delta, below_t[i], grads[i])
+                if i:
+                    below, slope = outputs[i - 1], slopes[i - 1]
+                    dot(weights_t[i], delta, deltas[i - 1])
+                    delta = deltas[i - 1]
+                    multiply(below, below, slope)
+                    subtract(below, slope, slope)
+                    multiply(delta, slope, delta)
+            
+            # weights and biases in one go, all layers at once
+            update(grads)
+        
+        return load, step, error.reshape(-1)
+    
+    def _record(self, losses, epoch, loss, record_every, stopping):
+        # stores the loss and returns True if early stopping says we're done
+        if epoch % record_every == 0:
+            losses[epoch // record_every] = loss
+        if stopping.active() and stopping.check(epoch + 1, loss):
+            self.epochs_run = epoch + 1
+            if stopping.reason == "target":
+                self.converged_epoch = epoch + 1
+            return True
+        return False
+    
+    def train(self, X, y, epochs, learning_rate, record_every=1,
+              progress=None, progress_every=100,
+              optimizer="sgd", target_loss=None, patience=None, min_delta=1e-6):
+        # Full-batch training, every epoch is one step over all of X.
+        # optimizer is a name from optimizers.OPTIMIZERS or an optimizer object.
+        # Stops early once the loss reaches target_loss, or when it hasn't
+        # improved by min_delta for patience epochs (both off by default).
+        # Returns the loss of every record_every-th epoch as a numpy array.
+        # progress(epochs_done, losses_so_far) gets called every progress_every
+        # epochs, returning True from it stops training early
+        # version goes up once now and once when done, so nothing cached
+        # mid-run shares a version with the finished weights
+        self.version += 1
+        try:
+            update = make_optimizer(optimizer, learning_rate).bind(self.layers)
+            load, step, error = self._trainer(len(X), update)
+            load(X, y)
+            stopping = EarlyStopping(target_loss, patience, min_delta)
+            watching = stopping.active()
+            self.epochs_run = epochs
+            self.converged_epoch = None
+            dot = np.dot
+            losses = np.empty((epochs + record_every - 1) // record_every, self.dtype)
+            for epoch in range(epochs):
+                step()
+                if watching or epoch % record_every == 0:
+                    # mean squared error straight from the error we already have
+                    loss = dot(error, error) / error.size
+                    if self._record(losses, epoch, loss, record_every, stopping):
+                        return losses[:epoch // record_every + 1]
+                if progress is not None and (epoch + 1) % progress_every == 0:
+                    recorded = losses[:epoch // record_every + 1]
+                    if progress(epoch + 1, recorded):
+                        self.epochs_run = epoch + 1
+                        return recorded
+            return losses
+        finally:
+            self.version += 1
+    
+    def train_batches(self, data, epochs, learning_rate, batch_size=32, shuffle=True,
+                      seed=None, record_every=1, progress=None, progress_every=1,
+                      optimizer="sgd", target_loss=None, patience=None, min_delta=1e-6):
+        # Mini-batch training over a datasets.Dataset, which can be bigger than
+        # memory. The loss for an epoch is the mean over every batch of that epoch
+        # (measured before each batch's update). Same return value, early
+        # stopping and progress hook as train()
+        self.version += 1
+        try:
+            rng = np.random.default_rng(seed)
+            update = make_optimizer(optimizer, learning_rate).bind(self.layers)
+            trainers = {}  # batch length -> (load, step, error), the last batch can be short
+            stopping = EarlyStopping(target_loss, patience, min_delta)
+            self.epochs_run = epochs
+            self.converged_epoch = None
+            dot = np.dot
+            losses = np.empty((epochs + record_every - 1) // record_every, self.dtype)
+            for epoch in range(epochs):
+                squared_error = 0.0
+                for X, y in batches(data, batch_size, shuffle, rng):
+                    if len(X) not in trainers:
+                        trainers[len(X)] = self._trainer(len(X), update)
+                    load, step, error = trainers[len(X)]
+                    load(X, y)
+                    step()
+                    squared_error += dot(error, error)
+                loss = squared_error / (len(data) * data.output_size)
+                if self._record(losses, epoch, loss, record_every, stopping):
+                    return losses[:epoch // record_every + 1]
+                if progress is not None and (epoch + 1) % progress_every == 0:
+                    recorded = losses[:epoch // record_every + 1]
+                    if progress(epoch + 1, recorded):
+                        self.epochs_run = epoch + 1
+                        return recorded
+            return losses
+        finally:
+            self.version += 1
+    
+    def predict(self, X):
+        return np.round(self.infer(X))
+
+class TrainingWorker:
+    # Runs nn.train() (or train_batches() for mini-batches) on a background
+    # thread so the window doesn't freeze.
+    # Progress goes out through the updates queue as
+    #   ("progress", epoch, losses, (layer1, layer2, ...))  - weights are copies
+    #   ("done", epochs_run, losses, seconds)
+    #   ("error", exception)
+    # and progress messages are throttled to one per min_interval seconds.
+    # Full batch on more than FULL_BATCH_ROWS rows turns into mini-batches of
+    # DEFAULT_BATCH_SIZE, check batch_size to see which one it ended up as
+    def __init__(self, nn, data, epochs, learning_rate, batch_size=None, min_interval=0.05,
+                 **options):
+        self.nn = nn
+        self.options = options  # optimizer / early stopping settings for train()
+        self.data = data  # a datasets.Dataset
+        if (not batch_size or batch_size >= len(data)) and len(data) > FULL_BATCH_ROWS:
+            batch_size = DEFAULT_BATCH_SIZE
+        self.batch_size = batch_size  # None = full batch
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.min_interval = min_interval
+        self.updates = queue.Queue()
+        self.stopped = False
+        self._stop = threading.Event()
+        self._resume = threading.Event()  # cleared while paused
+        self._resume.set()
+        self._last_post = 0.0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        self.thread.start()
+    
+    def running(self):
+        return self.thread.is_alive()
+    
+    def paused(self):
+        return not self._resume.is_set()
+    
+    def pause(self):
+        self._resume.clear()
+    
+    def resume(self):
+        self._resume.set()
+    
+    def stop(self):
+        self._stop.set()
+        self._resume.set()  # a paused worker has to wake up to notice
+    
+    def _progress(self, epoch, losses):
+        self._resume.wait()  # blocks here while paused
+        if self._stop.is_set():
+            self.stopped = True
+            return True
+        now = time.perf_counter()
+        if now - self._last_post >= self.min_interval:
+            self._last_post = now
+            weights = tuple(layer.copy() for layer in self.nn.layers)
+            self.updates.put(("progress", epoch, losses, weights))
+        return False
+    
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            if self.batch_size and self.batch_size < len(self.data):
+                losses = self.nn.train_batches(self.data, self.epochs, self.learning_rate,
+                                               self.batch_size, progress=self._progress,
+                                               **self.options)
+            else:
+                losses = self.nn.train(np.asarray(self.data.X), np.asarray(self.data.y),
+                                       self.epochs, self.learning_rate, progress=self._progress,
+                                       **self.options)
+        except Exception as e:  # goes to the GUI instead of dying quietly
+            self.updates.put(("error", e))
+            return
+        self.updates.put(("done", self.nn.epochs_run, losses, time.perf_counter() - start))
@@ -0,0 +1,130 @@
+# Weight update rules for NeuralNetwork training.
+# bind(params) sets up whatever state the rule keeps (one array per parameter,
+# allocated once) and returns update(grads), which moves every parameter in
+# place. grads point downhill already (they're d(-loss)/d(param)), so the
+# update adds them, and update() may scribble over the grads it's given.
+import numpy as np
+
+
+class SGD:
+    # plain gradient descent, what NeuralNetwork always did
+    def __init__(self, learning_rate=0.1):
+        self.learning_rate = learning_rate
+
+    def bind(self, params):
+        rate = np.array(self.learning_rate, params[0].dtype)
+        multiply, add = np.multiply, np.add
+
+        def update(grads):
+            for param, grad in zip(params, grads):
+                multiply(grad, rate, grad)
+                add(param, grad, param)
+        return update
+
+
+class Momentum:
+    # velocity = beta * velocity + grad, then step along the velocity
+    def __init__(self, learning_rate=0.1, beta=0.9):
+        self.learning_rate = learning_rate
+        self.beta = beta
+
+    def bind(self, params):
+        dtype = params[0].dtype
+        rate, beta = np.array(self.learning_rate, dtype), np.array(self.beta, dtype)
+        velocity = [np.zeros_like(p) for p in params]
+        multiply, add = np.multiply, np.add
+
+        def update(grads):
+            for param, grad, v in zip(params, grads, velocity):
+                multiply(v, beta, v)
+                add(v, grad, v)
+                multiply(v, rate, grad)
+                add(param, grad, param)
+        return update
+
+
+class RMSProp:
+    # divides each step by a running average of that weight's squared gradient
+    def __init__(self, learning_rate=0.01, beta=0.9, epsilon=1e-8):
+        self.learning_rate = learning_rate
+        self.beta = beta
+        self.epsilon = epsilon
+
+    def bind(self, params):
+        dtype = params[0].dtype
+        rate, beta = np.array(self.learning_rate, dtype), np.array(self.beta, dtype)
+        rest, epsilon = np.array(1 - self.beta, dtype), np.array(self.epsilon, dtype)
+        mean_square = [np.zeros_like(p) for p in params]
+        scratch = [np.empty_like(p) for p in params]
+        multiply, add, divide, sqrt = np.multiply, np.add, np.divide, np.sqrt
+
+        def update(grads):
+            for param, grad, ms, tmp in zip(params, grads, mean_square, scratch):
+                multiply(grad, grad, tmp)
+                multiply(tmp, rest, tmp)
+                multiply(ms, beta, ms)
+                add(ms, tmp, ms)
+                sqrt(ms, tmp)
+                add(tmp, epsilon, tmp)
+                divide(grad, tmp, grad)
+                multiply(grad, rate, grad)
+                add(param, grad, param)
+        return update
+
+
+class Adam:
+    # momentum + RMSProp, with the bias correction folded into the step size
+    def __init__(self, learning_rate=0.01, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        self.learning_rate = learning_rate
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+
+    def bind(self, params):
+        dtype = params[0].dtype
+        beta1, beta2 = np.array(self.beta1, dtype), np.array(self.beta2, dtype)
+        rest1, rest2 = np.array(1 - self.beta1, dtype), np.array(1 - self.beta2, dtype)
+        epsilon = np.array(self.epsilon, dtype)
+        rate = np.array(0.0, dtype)  # changes every step
+        mean = [np.zeros_like(p) for p in params]
+        mean_square = [np.zeros_like(p) for p in params]
+        scratch = [np.empty_like(p) for p in params]
+        multiply, add, divide, sqrt = np.multiply, np.add, np.divide, np.sqrt
+        step = [0]
+
+        def update(grads):
+            step[0] += 1
+            t = step[0]
+            rate[...] = self.learning_rate * (1 - self.beta2 ** t) ** 0.5 / (1 - self.beta1 ** t)
+            for param, grad, m, ms, tmp in zip(params, grads, mean, mean_square, scratch):
+                multiply(m, beta1, m)
+                multiply(grad, rest1, tmp)
+                add(m, tmp, m)
+                multiply(ms, beta2, ms)
+                multiply(grad, grad, tmp)
+                multiply(tmp, rest2, tmp)
+                add(ms, tmp, ms)
+                sqrt(ms, tmp)
+                add(tmp, epsilon, tmp)
+                divide(m, tmp, tmp)
+                multiply(tmp, rate, tmp)
+                add(param, tmp, param)
+        return update
+
+
+OPTIMIZERS = {
+    "sgd": SGD,
+    "momentum": Momentum,
+    "rmsprop": RMSProp,
+    "adam": Adam,
+}
+
+
+def make_optimizer(optimizer, learning_rate):
+    # accepts a name from OPTIMIZERS or an optimizer object (returned as is)
+    if not isinstance(optimizer, str):
+        return optimizer
+    try:
+        return OPTIMIZERS[optimizer.lower()](learning_rate)
+    except KeyError:
+        raise ValueError(f"Unknown optimizer: {optimizer}") from None
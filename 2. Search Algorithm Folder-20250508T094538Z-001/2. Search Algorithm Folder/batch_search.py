@@ -0,0 +1,179 @@
+# Headless batch runner - no Tk, no popups.
+# Loads a graph once, reads (start, goal, algorithm, limit) queries from a
+# file or stdin and spreads them over a process pool. Every result comes
+# back as one JSON line with how long the query took.
+#
+# usage:
+#   python batch_search.py graph.txt queries.txt --workers 8 > results.jsonl
+#
+# graph file: edge list or .gidx, see graph_io
+# query file: "start,goal,algorithm[,limit]" or JSON lines with those keys
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from graph_index import GraphIndex
+from graph_io import load_graph
+from search_algorithms import iddfs, bidirectional_bfs, ucs
+from search_cache import SearchCache
+
+ALGORITHMS = ("bfs", "dls", "iddfs", "bidirectional", "ucs")
+
+# set up once per worker process by _init_worker
+_index = None
+_cache = None
+
+
+def parse_query(line):
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('{'):
+        query = json.loads(line)
+    else:
+        parts = [p.strip() for p in line.split(',')]
+        query = dict(zip(("start", "goal", "algorithm", "limit"), parts))
+    if "start" not in query or "goal" not in query:
+        raise ValueError("need at least start and goal")
+    query.setdefault("algorithm", "bfs")
+    if query["algorithm"] not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {query['algorithm']!r}")
+    limit = query.get("limit")
+    query["limit"] = int(limit) if limit not in (None, "") else None
+    return query
+
+
+def _init_worker(graph_arrays):
+    # the graph gets pickled once per worker here instead of once per task
+    global _index, _cache
+    _index = GraphIndex.from_arrays(*graph_arrays)
+    _cache = SearchCache(_index)  # lots of queries share a few hub sources
+
+
+def run_query(query):
+    start, goal = query["start"], query["goal"]
+    algo = query["algorithm"]
+    record = {"id": query["id"], "start": start, "goal": goal,
+              "algorithm": algo, "limit": query["limit"]}
+    if start not in _index:
+        record["error"] = f"unknown start node {start!r}"
+        return record
+
+    if algo == "dls" and query["limit"] is None:
+        record["error"] = "dls needs a limit"
+        return record
+
+    began = time.perf_counter()
+    try:
+        if algo == "bfs":
+            result = _cache.bfs(start, goal)
+        elif algo == "dls":
+            result = _cache.dls(start, goal, query["limit"])
+        elif algo == "iddfs":
+            result = iddfs(_index, start, goal, query["limit"])
+        elif algo == "ucs":
+            result = ucs(_index, start, goal)
+        else:  # bidirectional
+            result = bidirectional_bfs(_index, start, goal)
+    except Exception as e:  # e.g. ucs on a negative weight, only this query fails
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    record["seconds"] = time.perf_counter() - began
+
+    record["found"] = result.path is not None or (bool(result) and result[-1] == goal)
+    record["visited"] = len(result)
+    record["expanded"] = result.expanded
+    record["stats"] = result.stats.as_dict()
+    record["path"] = result.path
+    if result.cost is not None:
+        record["cost"] = result.cost
+    if query.get("visits"):
+        record["visit_order"] = list(result)
+    return record
+
+
+def run_chunk(queries):
+    return [run_query(q) for q in queries]
+
+
+def iter_chunks(lines, chunk_size, with_visits):
+    chunk = []
+    for number, line in enumerate(lines):
+        try:
+            query = parse_query(line)
+        except (ValueError, TypeError) as e:
+            query = {"id": number, "error": f"bad query: {e}"}
+        if query is None:
+            continue
+        query.setdefault("id", number)
+        query["visits"] = with_visits
+        chunk.append(query)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(index, lines, out, workers=None, chunk_size=64, with_visits=False):
+    # keeps a bounded number of chunks in flight so huge query files
+    # stream through instead of all being submitted up front
+    graph_arrays = index.to_arrays()
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(graph_arrays,)) as pool:
+        pending = set()
+        for chunk in iter_chunks(lines, chunk_size, with_visits):
+            bad = [q for q in chunk if "error" in q]
+            for query in bad:
+                out.write(json.dumps({"id": query["id"], "error": query["error"]}) + "\n")
+            chunk = [q for q in chunk if "error" not in q]
+            if chunk:
+                pending.add(pool.submit(run_chunk, chunk))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _write_results(done, out)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            _write_results(done, out)
+
+
+def _write_results(futures, out):
+    for future in futures:
+        for record in future.result():
+            out.write(json.dumps(record) + "\n")
+    out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run graph search queries in bulk")
+    parser.add_argument("graph", help="edge list or .gidx file")
+    parser.add_argument("queries", nargs="?", default="-", help="query file, '-' for stdin")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-c", "--chunk-size", type=int, default=64)
+    parser.add_argument("-o", "--output", default="-", help="results file, '-' for stdout")
+    parser.add_argument("--visits", action="store_true", help="include the full visit order")
+    args = parser.parse_args(argv)
+
+    began = time.perf_counter()
+    index = load_graph(args.graph)
+    print(f"Loaded {len(index)} nodes in {time.perf_counter() - began:.3f} seconds",
+          file=sys.stderr)
+
+    queries = sys.stdin if args.queries == "-" else open(args.queries)
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        run_batch(index, queries, out, args.workers, args.chunk_size, args.visits)
+    finally:
+        if queries is not sys.stdin:
+            queries.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Benchmarks for the search code on generated graphs.
+# Times bfs/dls/vector_bfs (full traversals, no goal) against networkx's own
+# bfs/dfs on a few graph families, plus the raw Queue/Stack operations.
+# Results go out as JSON so two runs can be diffed before/after a change.
+#
+# usage:
+#   python benchmark_search.py --sizes 100 1000 10000 --output before.json
+#   python benchmark_search.py --families grid tree --memory
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import deque
+
+import networkx as nx
+
+from graph_index import GraphIndex
+from search_algorithms import bfs, dls
+from search_stats import SearchStats
+from stack_queue import Queue, Stack
+from vector_bfs import VectorBFS
+
+FAMILIES = ("grid", "random", "scale_free", "tree")
+
+
+def make_graph(family, n, seed=42):
+    # every family gets int labels 0..n-1 so sorting neighbors is cheap and fair
+    if family == "grid":
+        side = max(int(round(n ** 0.5)), 1)
+        G = nx.grid_2d_graph(side, side)
+    elif family == "random":
+        # Erdos-Renyi with average degree around 8
+        G = nx.fast_gnp_random_graph(n, min(8.0 / max(n - 1, 1), 1.0), seed=seed)
+    elif family == "scale_free":
+        G = nx.barabasi_albert_graph(n, 3, seed=seed)
+    elif family == "tree":
+        G = nx.random_labeled_tree(n, seed=seed) if hasattr(nx, "random_labeled_tree") \
+            else nx.random_tree(n, seed=seed)
+    else:
+        raise ValueError(f"Unknown graph family: {family}")
+    return nx.convert_node_labels_to_integers(G)
+
+
+def best_of(repeats, func):
+    # smallest wall time over a few runs, plus whatever the last run returned
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_graph(family, n, repeats, limit, memory):
+    G = make_graph(family, n)
+    rows = []
+    build_time, index = best_of(repeats, lambda: GraphIndex.from_graph(G))
+    base = {"family": family, "nodes": G.number_of_nodes(), "edges": G.number_of_edges()}
+    rows.append(dict(base, engine="GraphIndex.from_graph", seconds=build_time))
+
+    def run_ours(name, func):
+        # func(stats) runs one search and returns its SearchResult
+        seconds, result = best_of(repeats, func)
+        stats = result.stats
+        row = dict(base, engine=name, seconds=seconds, expanded=stats.expanded,
+                   nodes_per_sec=stats.expanded / seconds if seconds else None,
+                   peak_frontier=stats.peak_frontier)
+        if memory:
+            # separate run, tracemalloc slows everything down a lot
+            tracked = SearchStats(track_memory=True)
+            func(tracked)
+            row["peak_memory"] = tracked.peak_memory
+        rows.append(row)
+
+    # root 0 always exists, goal None means traverse everything reachable
+    run_ours("bfs", lambda stats=None: bfs(index, 0, None, stats))
+    run_ours(f"dls(limit={limit})", lambda stats=None: dls(index, 0, None, limit, stats))
+    vector = VectorBFS(index)  # numpy arrays built once, outside the timing
+    run_ours("vector_bfs", lambda stats=None: vector.bfs(0, None, stats))
+
+    def run_nx(name, func):
+        seconds, visited = best_of(repeats, func)
+        rows.append(dict(base, engine=name, seconds=seconds, expanded=visited,
+                         nodes_per_sec=visited / seconds if seconds else None))
+
+    run_nx("networkx.bfs_edges", lambda: 1 + sum(1 for _ in nx.bfs_edges(G, 0)))
+    run_nx(f"networkx.dfs_preorder_nodes(limit={limit})",
+           lambda: sum(1 for _ in nx.dfs_preorder_nodes(G, 0, depth_limit=limit)))
+    return rows
+
+
+def bench_containers(n, repeats):
+    # raw push/pop throughput, n items in then n items out
+    def queue_run(queue):
+        for i in range(n):
+            queue.enqueue(i)
+        while not queue.is_empty():
+            queue.dequeue()
+
+    def deque_run():
+        d = deque()
+        for i in range(n):
+            d.append(i)
+        while d:
+            d.popleft()
+
+    def stack_run(stack):
+        for i in range(n):
+            stack.push(i)
+        while not stack.is_empty():
+            stack.pop()
+
+    cases = [
+        ("Queue", lambda: queue_run(Queue())),
+        ("Queue(typecode='q')", lambda: queue_run(Queue(typecode='q'))),
+        ("collections.deque", deque_run),
+        ("Stack", lambda: stack_run(Stack())),
+        ("Stack(typecode='q')", lambda: stack_run(Stack(typecode='q'))),
+    ]
+    rows = []
+    for name, func in cases:
+        seconds, _ = best_of(repeats, func)
+        rows.append({"family": "containers", "items": n, "engine": name, "seconds": seconds,
+                     "ops_per_sec": 2 * n / seconds if seconds else None})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the graph searches")
+    parser.add_argument("--families", nargs="+", choices=FAMILIES, default=list(FAMILIES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=50, help="depth limit for dls")
+    parser.add_argument("--memory", action="store_true", help="also measure peak memory")
+    parser.add_argument("-o", "--output", default="-", help="JSON file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for n in args.sizes:
+        for family in args.families:
+            for row in bench_graph(family, n, args.repeats, args.limit, args.memory):
+                rows.append(row)
+                print(f"{row['family']:>10} {row['nodes']:>8} {row['engine']:<42} "
+                      f"{row['seconds'] * 1000:10.3f} ms", file=sys.stderr)
+        for row in bench_containers(n, args.repeats):
+            rows.append(row)
+            print(f"{'containers':>10} {n:>8} {row['engine']:<42} "
+                  f"{row['seconds'] * 1000:10.3f} ms", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "networkx": nx.__version__,
+        "args": vars(args),
+        "results": rows,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
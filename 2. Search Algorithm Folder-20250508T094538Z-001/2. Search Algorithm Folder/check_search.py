@@ -0,0 +1,294 @@
+# Regression check for the search code around the plain bfs/dls loops:
+#   SearchCache   cached bfs/dls give what the uncached ones give, including
+#                 after the graph is edited and with a tiny memory budget
+#   graph_io      .txt and .gidx save/load round trips keep every node,
+#                 edge and weight (and the direction for .gidx)
+#   ucs / astar   path costs match a plain Dijkstra written out below, and
+#                 A* with layout_scale's heuristic is still optimal
+#   events        the VISIT events of bfs_events/dls_events are bfs/dls's order
+#   stack_queue   Queue, Stack and PairStack against a list for every
+#                 overflow policy
+# Runs on random graphs with string labels, so label order differs from id order.
+#
+# usage:
+#   python check_search.py             # exits 1 on the first mismatch
+#   python check_search.py --graphs 200 --seed 7
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import tempfile
+
+from graph_index import GraphIndex
+from graph_io import load_graph, read_edge_list, save_graph
+from search_algorithms import (VISIT, astar, bfs, bfs_events, dls, dls_events,
+                               euclidean_heuristic, labelled, layout_scale, ucs)
+from search_cache import SearchCache
+from stack_queue import BOUNDED, GROW, RAISE, PairStack, Queue, Stack
+
+WEIGHTS = (1.0, 2.0, 0.5, 7.25)  # plus 0 in some graphs (it turns the A* heuristic off)
+
+
+def random_graph(rng, directed, index=None):
+    # adds random nodes and weighted edges to index (a new one if not given)
+    index = index if index is not None else GraphIndex(directed=directed)
+    n = rng.randint(1, 150)
+    degree = rng.choice((0.5, 2, 6))  # average, so some graphs fall apart
+    labels = [f"n{rng.randrange(400)}" for _ in range(n)]
+    for label in labels:
+        index.add_node(label)
+    labels = list(index.labels)
+    weights = WEIGHTS + (0.0,) if rng.random() < 0.3 else WEIGHTS
+    for _ in range(int(n * degree / 2)):
+        a, b = rng.choice(labels), rng.choice(labels)
+        if a != b:
+            index.add_edge(a, b, rng.choice(weights))
+    return index.freeze()
+
+
+def edges(index):
+    # {(a, b): weight} by label, what a round trip has to keep
+    index.freeze()
+    labels, offsets, targets, weights = index.labels, index.offsets, index.targets, index.weights
+    return {(labels[i], labels[targets[slot]]): weights[slot]
+            for i in range(len(labels)) for slot in range(offsets[i], offsets[i + 1])}
+
+
+def hops(index, root):
+    # label -> number of edges from root, plain BFS as the reference
+    labels, ids = index.labels, index.ids
+    dist = {root: 0}
+    frontier = [root]
+    while frontier:
+        next_frontier = []
+        for label in frontier:
+            for other in index.neighbors(ids[label]):
+                if labels[other] not in dist:
+                    dist[labels[other]] = dist[label] + 1
+                    next_frontier.append(labels[other])
+        frontier = next_frontier
+    return dist
+
+
+def dijkstra(index, root):
+    # label -> cheapest total weight from root, the textbook version
+    graph = {}
+    for (a, b), weight in edges(index).items():
+        graph.setdefault(a, []).append((b, weight))
+    dist = {root: 0.0}
+    heap = [(0.0, root)]
+    while heap:
+        cost, label = heapq.heappop(heap)
+        if cost > dist[label]:
+            continue
+        for other, weight in graph.get(label, ()):
+            if cost + weight < dist.get(other, math.inf):
+                dist[other] = cost + weight
+                heapq.heappush(heap, (cost + weight, other))
+    return dist
+
+
+def path_problem(index, root, goal, path, expected):
+    # None if path is a real root->goal path with `expected` edges (or missing when it should be)
+    if expected is None:
+        return None if path is None else "path to an unreachable goal"
+    if path is None:
+        return "no path to a reachable goal"
+    if path[0] != root or path[-1] != goal or len(path) != expected + 1:
+        return f"path {path} isn't a shortest path ({expected} hops)"
+    known = edges(index)
+    for a, b in zip(path, path[1:]):
+        if (a, b) not in known:
+            return f"path uses a missing edge {a}->{b}"
+    return None
+
+
+def check_cache(rng, directed):
+    index = random_graph(rng, directed)
+    # a tiny budget as well, so entries get evicted and recomputed
+    cache = SearchCache(index, max_bytes=rng.choice((32 * 1024 * 1024, 2048)))
+    for edit in range(3):
+        labels = index.labels
+        roots = rng.sample(labels, min(3, len(labels)))
+        for _ in range(10):
+            root = rng.choice(roots)
+            goal = rng.choice((rng.choice(labels), None, "missing"))
+            limit = rng.randint(0, 6)
+            dist = hops(index, root)
+            for attempt in range(2):  # second time should come from the cache
+                where = f"edit {edit} root={root} goal={goal} limit={limit} attempt {attempt}"
+                got = cache.bfs(root, goal)
+                if list(got) != list(bfs(index, root, goal)):
+                    return f"{where}: cached bfs visit order differs"
+                problem = path_problem(index, root, goal, got.path, dist.get(goal))
+                if problem:
+                    return f"{where}: cached bfs {problem}"
+                if list(cache.dls(root, goal, limit)) != list(dls(index, root, goal, limit)):
+                    return f"{where}: cached dls visit order differs"
+        # edit the graph under the cache, it has to notice
+        random_graph(rng, directed, index)
+    if cache.hits == 0:
+        return "the cache never answered anything"
+    return None
+
+
+def check_io(rng, directed, folder):
+    index = random_graph(rng, directed)
+    expected = edges(index)
+    for name in ("graph.txt", "graph.gidx"):
+        path = os.path.join(folder, name)
+        save_graph(index, path)
+        if name.endswith(".txt"):
+            # the text format doesn't say whether it's directed
+            loaded = read_edge_list(path, directed) if directed else load_graph(path)
+        else:
+            loaded = load_graph(path)
+            if loaded.directed != index.directed or loaded.labels != index.labels:
+                return f"{name}: direction or label order changed"
+        if set(loaded.labels) != set(index.labels):
+            return f"{name}: nodes changed ({len(index.labels)} -> {len(loaded.labels)})"
+        if edges(loaded) != expected:
+            return f"{name}: edges or weights changed"
+    return None
+
+
+def check_weighted(rng, directed):
+    index = random_graph(rng, directed)
+    labels = index.labels
+    pos = {label: (rng.random(), rng.random()) for label in labels}
+    if rng.random() < 0.5:
+        # weights close to the drawn lengths, so the heuristic actually steers A*
+        for a, b in edges(index):
+            length = math.hypot(pos[a][0] - pos[b][0], pos[a][1] - pos[b][1])
+            index.add_edge(a, b, round(length * rng.uniform(1, 1.5), 3))
+        index.freeze()
+    heuristic = euclidean_heuristic(pos, layout_scale(index, pos))
+    known = edges(index)
+    for _ in range(5):
+        root = rng.choice(labels)
+        goal = rng.choice((rng.choice(labels), "missing"))
+        dist = dijkstra(index, root)
+        for name, result in (("ucs", ucs(index, root, goal)),
+                             ("astar", astar(index, root, goal, heuristic))):
+            where = f"{name} root={root} goal={goal}"
+            if goal not in dist:
+                if result.path is not None or result.cost is not None:
+                    return f"{where}: found a path to an unreachable goal"
+                continue
+            if result.path is None or not math.isclose(result.cost, dist[goal], abs_tol=1e-9):
+                return f"{where}: cost {result.cost}, Dijkstra says {dist[goal]}"
+            walked = sum(known.get((a, b), math.nan) for a, b in zip(result.path, result.path[1:]))
+            if result.path[0] != root or result.path[-1] != goal or not math.isclose(
+                    walked, result.cost, abs_tol=1e-9):
+                return f"{where}: path {result.path} doesn't add up to its cost {result.cost}"
+    if len(labels) > 1:
+        negative = GraphIndex(directed=directed)
+        negative.add_edge(labels[0], labels[1], -1.0)
+        try:
+            ucs(negative, labels[0], labels[1])
+        except ValueError:
+            pass
+        else:
+            return "ucs accepted a negative edge weight"
+    return None
+
+
+def check_events(rng, directed):
+    index = random_graph(rng, directed)
+    root = rng.choice(index.labels)
+    goal = rng.choice((rng.choice(index.labels), None))
+    limit = rng.randint(0, 6)
+    for name, events, plain in (
+            ("bfs", bfs_events(index, root, goal), bfs(index, root, goal)),
+            ("dls", dls_events(index, root, goal, limit), dls(index, root, goal, limit))):
+        visits = [event.node for event in labelled(index, events) if event.kind == VISIT]
+        if visits != list(plain):
+            return f"{name}_events root={root} goal={goal}: VISIT events differ from {name}()"
+    return None
+
+
+def check_containers(rng):
+    # each container against a plain list, for every overflow policy
+    for policy in (GROW, RAISE, BOUNDED):
+        for typecode in (None, 'q'):
+            limit = rng.randint(1, 40)
+            where = f"policy={policy} typecode={typecode} max_size={limit}"
+            containers = (("Queue", Queue(limit, policy, typecode, capacity=rng.randint(1, 8)), 0),
+                          ("Stack", Stack(limit, policy, typecode), -1),
+                          ("PairStack", PairStack(limit, policy, typecode), -1))
+            for name, container, take in containers:
+                model = []
+                for _ in range(400):
+                    if rng.random() < 0.6:
+                        item = rng.randrange(1000)
+                        full = len(model) >= limit
+                        try:
+                            if name == "PairStack":
+                                container.push(item, item + 1)
+                            elif name == "Queue":
+                                container.enqueue(item)
+                            else:
+                                container.push(item)
+                        except OverflowError:
+                            if not (full and policy == RAISE):
+                                return f"{name} {where}: OverflowError with {len(model)} items"
+                            continue
+                        if full and policy == RAISE:
+                            return f"{name} {where}: no OverflowError when full"
+                        if not full or policy == GROW:
+                            model.append(item)
+                    else:
+                        got = container.dequeue() if name == "Queue" else container.pop()
+                        expected = model.pop(take) if model else None
+                        if name == "PairStack" and expected is not None:
+                            expected = (expected, expected + 1)
+                        if got != expected:
+                            return f"{name} {where}: took out {got}, expected {expected}"
+                    if len(container) != len(model):
+                        return f"{name} {where}: length {len(container)}, expected {len(model)}"
+    queue = Queue(1, "sideways")
+    queue.enqueue(1)
+    try:
+        queue.enqueue(2)
+    except ValueError:
+        return None
+    return "unknown overflow policy was accepted"
+
+
+def check(graphs, seed):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as folder:
+        for number in range(graphs):
+            directed = number % 3 == 2
+            for name, run in (("cache", lambda: check_cache(rng, directed)),
+                              ("io", lambda: check_io(rng, directed, folder)),
+                              ("weighted", lambda: check_weighted(rng, directed)),
+                              ("events", lambda: check_events(rng, directed))):
+                problem = run()
+                if problem:
+                    return f"{name}, graph {number} (directed={directed}): {problem}"
+        for _ in range(20):
+            problem = check_containers(rng)
+            if problem:
+                return f"containers: {problem}"
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the search cache, graph I/O, "
+                                                 "weighted searches and containers")
+    parser.add_argument("--graphs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    problem = check(args.graphs, args.seed)
+    if problem:
+        print(f"FAIL: {problem}", file=sys.stderr)
+        return 1
+    print(f"ok: {args.graphs} graphs x cache, io, weighted, events, plus the containers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# Regression check: VectorBFS.bfs has to give exactly what bfs() gives.
+# Runs both on random graphs (sparse, dense, directed, with unreachable
+# parts) with string labels, so label order differs from id order, and
+# with alpha 0 (always top-down), 1 (the default switch) and a huge value
+# (bottom-up whenever there's anything left to visit). Compares the visit order, and checks the start->goal
+# path is made of real edges and is as short as bfs_tree says it should be.
+#
+# usage:
+#   python check_vector_bfs.py             # exits 1 on the first mismatch
+#   python check_vector_bfs.py --graphs 200 --seed 7
+import argparse
+import random
+import sys
+
+from graph_index import GraphIndex
+from search_algorithms import bfs, bfs_tree
+from vector_bfs import VectorBFS
+
+ALPHAS = (0.0, 1.0, 1e9)
+
+
+def random_graph(rng, directed):
+    n = rng.randint(1, 300)
+    degree = rng.choice((0.5, 2, 8, 30))  # average, so some graphs fall apart
+    index = GraphIndex(directed=directed)
+    labels = [f"n{i}" for i in range(n)]
+    rng.shuffle(labels)
+    for label in labels:
+        index.add_node(label)
+    for _ in range(int(n * degree / 2)):
+        a, b = rng.choice(labels), rng.choice(labels)
+        if a != b:
+            index.add_edge(a, b)
+    return index.freeze(), labels
+
+
+def path_problem(index, root, goal, path, reached):
+    # None if path is a shortest root->goal path (or correctly missing)
+    ids = index.ids
+    if goal not in ids or not reached:
+        return None if path is None else "path to an unreachable goal"
+    if path is None:
+        return "no path to a reachable goal"
+    _, parent = bfs_tree(index, root)
+    hops = 0
+    node = ids[goal]
+    while node != ids[root]:
+        node = parent[node]
+        hops += 1
+    if path[0] != root or path[-1] != goal or len(path) != hops + 1:
+        return f"path {path} isn't a shortest path ({hops} hops)"
+    offsets, targets = index.offsets, index.targets
+    for a, b in zip(path, path[1:]):
+        if ids[b] not in targets[offsets[ids[a]]:offsets[ids[a] + 1]]:
+            return f"path uses a missing edge {a}->{b}"
+    return None
+
+
+def check(graphs, seed):
+    rng = random.Random(seed)
+    for number in range(graphs):
+        directed = number % 3 == 2
+        index, labels = random_graph(rng, directed)
+        root = rng.choice(labels)
+        # no goal (full traversal), a random node, and a label that isn't there
+        for goal in (None, rng.choice(labels), "missing"):
+            expected = bfs(index, root, goal)
+            reached = bool(expected) and expected[-1] == goal
+            for alpha in ALPHAS:
+                got = VectorBFS(index, alpha).bfs(root, goal)
+                where = (f"graph {number} (directed={directed}, {len(labels)} nodes) "
+                         f"root={root} goal={goal} alpha={alpha}")
+                if list(got) != list(expected):
+                    return f"{where}: visit order differs"
+                problem = path_problem(index, root, goal, got.path, reached)
+                if problem:
+                    return f"{where}: {problem}"
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check VectorBFS against bfs")
+    parser.add_argument("--graphs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    problem = check(args.graphs, args.seed)
+    if problem:
+        print(f"FAIL: {problem}", file=sys.stderr)
+        return 1
+    print(f"ok: {args.graphs} graphs x 3 goals x alpha {ALPHAS}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# Compact integer-indexed adjacency (CSR) for the search algorithms
+# Node labels get interned to int ids once, and the neighbor lists are
+# sorted once, so the search loops don't have to hash strings or sort
+# on every expansion anymore.
+from array import array
+
+
+class GraphIndex:
+    def __init__(self, directed=False):
+        self.directed = directed
+        self.labels = []  # id -> label
+        self.ids = {}  # label -> id
+        # CSR layout: neighbors of node i are targets[offsets[i]:offsets[i + 1]]
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        self.weights = array('d')  # edge weight for each entry in targets (1.0 = unweighted)
+        self._pending = []  # edges added since the last freeze()
+        self.version = 0  # bumped on every change so caches know when to drop results
+
+    @classmethod
+    def from_graph(cls, graph):
+        # build straight from a networkx graph (or anything with nodes/neighbors)
+        index = cls(directed=graph.is_directed())
+        for node in graph.nodes:
+            index._intern(node)
+        ids = index.ids
+        targets = index.targets
+        weights = index.weights
+        offsets = index.offsets
+        labels = index.labels
+        for node in labels:
+            adj = graph[node]
+            row = sorted(graph.neighbors(node))  # labels are the node keys
+            targets.extend(ids[n] for n in row)
+            weights.extend(adj[n].get('weight', 1.0) for n in row)
+            offsets.append(len(targets))
+        return index
+
+    @classmethod
+    def from_arrays(cls, labels, offsets, targets, directed=False, weights=None):
+        # rebuild from an already frozen index's parts (e.g. after pickling)
+        index = cls(directed=directed)
+        index.labels = list(labels)
+        index.ids = {label: i for i, label in enumerate(index.labels)}
+        index.offsets = offsets
+        index.targets = targets
+        index.weights = weights if weights is not None else array('d', [1.0]) * len(targets)
+        return index
+
+    def to_arrays(self):
+        self.freeze()
+        return self.labels, self.offsets, self.targets, self.directed, self.weights
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self.ids
+
+    def _intern(self, label):
+        node_id = self.ids.get(label)
+        if node_id is None:
+            node_id = len(self.labels)
+            self.ids[label] = node_id
+            self.labels.append(label)
+        return node_id
+
+    def add_node(self, label):
+        node_id = self._intern(label)
+        if node_id == len(self.offsets) - 1:
+            # new node starts out with no neighbors, so just close its row
+            self.offsets.append(self.offsets[-1])
+            self.version += 1
+        return node_id
+
+    def add_edge(self, a, b, weight=1.0):
+        # edges are buffered and merged into the CSR arrays on the next freeze()
+        # adding an edge that's already there just updates its weight
+        self._pending.append((self.add_node(a), self.add_node(b), float(weight)))
+        self.version += 1
+
+    def freeze(self):
+        # rebuild the CSR arrays if there are edges waiting to be merged in
+        if not self._pending:
+            return self
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        # neighbor id -> weight for every node
+        adjacency = [dict(zip(targets[offsets[i]:offsets[i + 1]],
+                              weights[offsets[i]:offsets[i + 1]]))
+                     for i in range(len(self.labels))]
+        for a, b, weight in self._pending:
+            adjacency[a][b] = weight
+            if not self.directed:
+                adjacency[b][a] = weight
+        self._pending = []
+
+        key = self.labels.__getitem__
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        for row in adjacency:
+            ordered = sorted(row, key=key)
+            targets.extend(ordered)
+            weights.extend(row[t] for t in ordered)
+            offsets.append(len(targets))
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        return self
+
+    def neighbors(self, node_id):
+        # already sorted by label, same order sorted(graph.neighbors(...)) gave
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def visited_set(self):
+        # one byte per node, a lot cheaper than a set of labels
+        return bytearray(len(self.labels))
@@ -0,0 +1,146 @@
+# Loading and saving whole graphs instead of typing them in one edge at a time.
+#
+# Text format (.txt, .csv, anything else): one edge per line, "A,B" or "A B",
+# with an optional weight as a third column ("A,B,3"). A line with a single
+# name is a node with no edges, lines starting with '#' are comments.
+# Files are read line by line, never all at once.
+#
+# Binary format (.gidx): the frozen CSR arrays from GraphIndex written out
+# as-is, so loading is basically a memory copy out of an mmap.
+#   magic b"GIDX", then int64 header: format version, node count,
+#   target count, directed flag; then offsets (n + 1 int64),
+#   targets (m int64), weights (m float64, version 2 and up),
+#   then the labels as utf-8 separated by newlines
+#   (everything little-endian)
+import mmap
+import struct
+import sys
+from array import array
+
+from graph_index import GraphIndex
+
+MAGIC = b"GIDX"
+FORMAT_VERSION = 2  # version 1 files (no weights) can still be read
+HEADER = struct.Struct("<4s4q")
+
+
+def iter_edge_lines(path):
+    # streams (a, b) / (a, b, weight) tuples, or (a,) for lone nodes, from a text edge list
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split(',') if ',' in line else line.split()
+            parts = [p.strip() for p in parts]
+            if len(parts) == 1 or len(parts) == 2:
+                yield tuple(parts)
+            elif len(parts) == 3:
+                try:
+                    yield parts[0], parts[1], float(parts[2])
+                except ValueError:
+                    raise ValueError(f"{path}:{number}: bad weight in {line!r}") from None
+            else:
+                raise ValueError(f"{path}:{number}: expected 'A,B[,weight]', got {line!r}")
+
+
+def read_edge_list(path, directed=False):
+    index = GraphIndex(directed=directed)
+    for parts in iter_edge_lines(path):
+        if len(parts) == 1:
+            index.add_node(parts[0])
+        else:
+            index.add_edge(*parts)
+    return index.freeze()  # one CSR build at the end
+
+
+def write_edge_list(index, path):
+    index.freeze()
+    offsets, targets, labels = index.offsets, index.targets, index.labels
+    weights = index.weights
+    with open(path, "w", encoding="utf-8") as f:
+        for node_id, label in enumerate(labels):
+            row = targets[offsets[node_id]:offsets[node_id + 1]]
+            if not row:
+                f.write(f"{label}\n")  # keep lone nodes
+                continue
+            for slot in range(offsets[node_id], offsets[node_id + 1]):
+                other = targets[slot]
+                # undirected edges are stored both ways, only write them once
+                if index.directed or node_id <= other:
+                    if weights[slot] == 1.0:
+                        f.write(f"{label},{labels[other]}\n")
+                    else:
+                        f.write(f"{label},{labels[other]},{weights[slot]!r}\n")
+
+
+def write_binary(index, path):
+    index.freeze()
+    offsets, targets, weights = index.offsets, index.targets, index.weights
+    if sys.byteorder == "big":
+        offsets, targets, weights = array('q', offsets), array('q', targets), array('d', weights)
+        offsets.byteswap()
+        targets.byteswap()
+        weights.byteswap()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(index.labels),
+                            len(targets), int(index.directed)))
+        offsets.tofile(f)
+        targets.tofile(f)
+        weights.tofile(f)
+        f.write("\n".join(str(label) for label in index.labels).encode("utf-8"))
+
+
+def read_binary(path):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, n, m, directed = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or not 1 <= version <= FORMAT_VERSION:
+                raise ValueError(f"{path} isn't a graph index file")
+            start = HEADER.size
+            offsets = array('q')
+            offsets.frombytes(mm[start:start + 8 * (n + 1)])
+            start += 8 * (n + 1)
+            targets = array('q')
+            targets.frombytes(mm[start:start + 8 * m])
+            start += 8 * m
+            weights = None
+            if version >= 2:
+                weights = array('d')
+                weights.frombytes(mm[start:start + 8 * m])
+                start += 8 * m
+            text = mm[start:].decode("utf-8")
+    if sys.byteorder == "big":
+        offsets.byteswap()
+        targets.byteswap()
+        if weights is not None:
+            weights.byteswap()
+    labels = text.split("\n") if n else []
+    return GraphIndex.from_arrays(labels, offsets, targets, bool(directed), weights)
+
+
+def load_graph(path):
+    if str(path).endswith(".gidx"):
+        return read_binary(path)
+    return read_edge_list(path)
+
+
+def save_graph(index, path):
+    if str(path).endswith(".gidx"):
+        write_binary(index, path)
+    else:
+        write_edge_list(index, path)
+
+
+def to_networkx(index):
+    # bulk build of a networkx graph for drawing, networkx only gets
+    # imported here so the loaders themselves don't need it
+    import networkx as nx
+    index.freeze()
+    G = nx.DiGraph() if index.directed else nx.Graph()
+    labels, offsets, targets, weights = index.labels, index.offsets, index.targets, index.weights
+    G.add_nodes_from(labels)
+    G.add_weighted_edges_from((labels[node_id], labels[targets[slot]], weights[slot])
+                              for node_id in range(len(labels))
+                              for slot in range(offsets[node_id], offsets[node_id + 1]))
+    return G
@@ -0,0 +1,206 @@
+# Draws the graph for the search animation without redoing everything per step.
+# The layout is only recomputed when the graph version changes and the base
+# graph is drawn once. After that each animation step restyles a single
+# marker artist and blits it: the node that just stopped being "current"
+# gets stamped into the saved background as visited, and the new current
+# node is drawn on top. So a step costs the same no matter how big the graph is.
+#
+# Layout positions are kept between edits: new nodes start next to their
+# neighbors and only a few spring iterations are run from the old positions,
+# so adding a node doesn't reshuffle the whole picture.
+import random
+
+import numpy as np
+import networkx as nx
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+BASE_COLOR = to_rgba('lightblue')
+CURRENT_COLOR = to_rgba('orange')
+EDGE_BLACK = to_rgba('black')
+
+# (face color, edge color, marker size, edge width) for each node state
+VISITED_STYLE = (BASE_COLOR, EDGE_BLACK, 1200, 2)
+CURRENT_STYLE = (CURRENT_COLOR, EDGE_BLACK, 800, 4)
+
+# above this many nodes: batched drawing, no labels, smaller markers,
+# and no more networkx spring layout (each of its iterations is O(n^2))
+LARGE_GRAPH = 500
+LARGE_SCALE = 0.05  # marker sizes get multiplied by this for large graphs
+WARM_ITERATIONS = 5  # spring iterations after an edit, starting from the old layout
+
+
+class GraphRenderer:
+    def __init__(self, ax, canvas):
+        self.ax = ax
+        self.canvas = canvas
+        self.pos = None
+        self.layout_version = -1
+        self.path = []
+        self.shown = -1  # which animation step is currently on screen
+        self.marker = None  # one reusable marker + label for the highlighted node
+        self.label = None
+        self.background = None
+        self.scale = 1.0  # marker size multiplier, smaller on big graphs
+        self.degrees = {}  # node degrees at the last layout, to spot what an edit touched
+        # grab a fresh background whenever the canvas redraws (e.g. resize)
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def layout(self, G, version):
+        # the spring layout is the expensive part, only redo it if the graph changed
+        if version == self.layout_version and self.pos is not None:
+            return self.pos
+        old = self.pos or {}
+        new_nodes = [node for node in G if node not in old]
+        if len(new_nodes) > len(G) // 2:
+            # mostly a new graph (first draw or a file load), lay it out from scratch
+            if len(G) > LARGE_GRAPH:
+                pos = nx.spectral_layout(G)  # spring is O(n^2) per iteration, way too slow here
+            else:
+                pos = nx.spring_layout(G, seed=42)  # fixed seed so it doesn't jump around
+        else:
+            pos = {node: old[node] for node in G if node in old}
+            self._place_near_neighbors(G, pos, new_nodes)
+            if len(G) <= LARGE_GRAPH:
+                # warm start: a few iterations from where everything already is
+                pos = nx.spring_layout(G, pos=pos, iterations=WARM_ITERATIONS, seed=42)
+            else:
+                # only nudge the nodes around the edit, everything else stays put
+                moving = set(new_nodes)
+                moving.update(node for node in G if G.degree(node) != self.degrees.get(node))
+                for node in list(moving):
+                    moving.update(G.neighbors(node))
+                self._relax(G, pos, moving)
+        self.pos = pos
+        self.degrees = dict(G.degree())
+        self.layout_version = version
+        return self.pos
+
+    def _place_near_neighbors(self, G, pos, new_nodes):
+        # new node goes at the middle of its already placed neighbors, plus a
+        # little jitter so two new nodes don't land exactly on top of each other
+        jitter = random.Random(len(G))
+        for node in new_nodes:
+            placed = [pos[n] for n in G.neighbors(node) if n in pos]
+            if placed:
+                x, y = np.mean(placed, axis=0)
+            else:
+                x, y = jitter.uniform(-1, 1), jitter.uniform(-1, 1)
+            pos[node] = np.array([x + jitter.uniform(-0.05, 0.05),
+                                  y + jitter.uniform(-0.05, 0.05)])
+
+    def _relax(self, G, pos, moving):
+        # a few Fruchterman-Reingold steps for just the moving nodes:
+        # repulsion from every node, attraction along their edges.
+        # Costs O(len(moving) * n) per step instead of O(n^2).
+        if not moving:
+            return
+        nodes = list(G)
+        slot = {node: i for i, node in enumerate(nodes)}
+        xy = np.array([pos[node] for node in nodes], dtype=float)
+        movers = np.array([slot[node] for node in moving])
+        k = 2.0 / np.sqrt(len(nodes))  # ideal edge length for a [-1, 1] box
+        for step in range(WARM_ITERATIONS):
+            temperature = 0.1 * (1 - step / WARM_ITERATIONS)
+            delta = xy[movers, None, :] - xy[None, :, :]
+            dist = np.maximum(np.linalg.norm(delta, axis=2), 0.01)
+            force = (delta * (k * k / dist ** 2)[:, :, None]).sum(axis=1)
+            for row, i in enumerate(movers):
+                for other in G.neighbors(nodes[i]):
+                    d = xy[slot[other]] - xy[i]
+                    force[row] += d * np.linalg.norm(d) / k
+            length = np.maximum(np.linalg.norm(force, axis=1), 1e-9)
+            xy[movers] += force * (np.minimum(length, temperature) / length)[:, None]
+        for i in movers:
+            pos[nodes[i]] = xy[i]
+
+    def _draw_graph(self, G, pos, node_size, font_size):
+        self.ax.clear()
+        if len(G) <= LARGE_GRAPH:
+            nx.draw(G, pos, with_labels=True,
+                    node_color='lightblue',  # nice neutral color
+                    edge_color='gray', node_size=node_size,
+                    font_size=font_size, ax=self.ax)
+            weights = {(u, v): f"{w:g}" for u, v, w in G.edges(data='weight', default=1.0)}
+            if any(w != "1" for w in weights.values()):  # only label weighted graphs
+                nx.draw_networkx_edge_labels(G, pos, edge_labels=weights,
+                                             font_size=font_size * 0.7, ax=self.ax)
+            return
+        # big graph: one LineCollection for all edges and one scatter for all
+        # nodes, instead of networkx making an artist per label and so on
+        segments = np.array([(pos[u], pos[v]) for u, v in G.edges]).reshape(-1, 2, 2)
+        self.ax.add_collection(LineCollection(segments, colors='gray',
+                                              linewidths=0.5, zorder=1))
+        xy = np.array([pos[node] for node in G]).reshape(-1, 2)
+        self.ax.scatter(xy[:, 0], xy[:, 1], s=node_size * LARGE_SCALE,
+                        c=[BASE_COLOR], zorder=2)
+        self.ax.autoscale_view()
+        self.ax.set_axis_off()
+
+    def draw_graph(self, G, version):
+        # plain redraw after an edit (no animation)
+        self.forget()
+        self._draw_graph(G, self.layout(G, version), node_size=1200, font_size=15)
+        self.canvas.draw()
+
+    def draw_base(self, G, version):
+        pos = self.layout(G, version)
+        self._draw_graph(G, pos, node_size=600, font_size=10)
+        self.scale = LARGE_SCALE if len(G) > LARGE_GRAPH else 1.0
+        # animated artists are skipped by the normal draw and only blitted
+        self.marker = self.ax.scatter([0], [0], animated=True, zorder=3)
+        self.label = self.ax.text(0, 0, "", fontsize=10, ha='center', va='center',
+                                  animated=True, zorder=4)
+        self.path = []
+        self.shown = -1
+        self.canvas.draw()  # _on_draw saves the background
+
+    def forget(self):
+        # call before someone else clears the axes, so stale markers aren't blitted
+        self.marker = None
+        self.label = None
+        self.background = None
+        self.path = []
+        self.shown = -1
+
+    def _on_draw(self, event):
+        if self.marker is None:
+            return
+        # fresh background has no highlights on it, stamp the visited ones back in
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        shown, self.shown = self.shown, -1
+        if shown >= 0:
+            self.show_step(self.path, shown)
+
+    def _draw_node(self, node, style):
+        face, edge, size, width = style
+        x, y = self.pos[node]
+        self.marker.set_offsets([[x, y]])
+        self.marker.set_facecolors([face])
+        self.marker.set_edgecolors([edge])
+        self.marker.set_sizes([size * self.scale])
+        self.marker.set_linewidths([width])
+        self.ax.draw_artist(self.marker)
+        if self.scale < 1:
+            return  # no labels on big graphs
+        self.label.set_position((x, y))
+        self.label.set_text(str(node))
+        self.ax.draw_artist(self.label)
+
+    def show_step(self, path, step):
+        if self.background is None:
+            return
+        if step < self.shown or (path is not self.path and self.shown >= 0):
+            # going backwards or a different run, start again from the clean base
+            self.shown = -1
+            self.canvas.draw()
+        self.path = path
+        self.canvas.restore_region(self.background)
+        # nodes passed since the last frame become visited, baked into the background
+        for i in range(max(self.shown, 0), step):
+            self._draw_node(path[i], VISITED_STYLE)
+        if step > max(self.shown, 0):
+            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_node(path[step], CURRENT_STYLE)
+        self.shown = step
+        self.canvas.blit(self.ax.bbox)
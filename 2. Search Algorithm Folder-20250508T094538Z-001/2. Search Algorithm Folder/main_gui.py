@@ -1,13 +1,22 @@
+# The Tk window only gets built by main(), and networkx, matplotlib and the
+# renderer only get imported there, so importing this (for search_worker,
+# say) is quick and doesn't need a display
 import tkinter as tk
-from tkinter import ttk
-import matplotlib.pyplot as plt
-import networkx as nx
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import time
-from collections import deque  
-from search_algorithms import dls, bfs
+from tkinter import ttk, filedialog
+import threading
+import queue
+from search_algorithms import iddfs, bidirectional_bfs, ucs, astar, euclidean_heuristic, layout_scale
+from graph_index import GraphIndex
+from search_cache import SearchCache
+from search_stats import SearchStats
+import graph_io
 
-G = nx.Graph()  
+G = None  # networkx copy of the graph for drawing, made by main()
+index = GraphIndex()  # int-indexed copy of G that the searches run on
+search_cache = SearchCache(index)  # reuses traversals until the graph changes
+search_results = queue.Queue()  # search thread -> Tk thread
+search_thread = None
+search_stats = None  # stats of the search in progress, read live by the GUI
 
 class SearchNode:  # not using this yet but might need it later
     def __init__(self, state, parent=None):
@@ -25,38 +34,28 @@ def path_trace(node):
 
 def animate_path(path):
     traversal_text.delete('1.0', tk.END)
-    # show the search happening step by step
-    for i, curr_node in enumerate(path):
-        ax.clear()
-        # using fixed seed so graph doesn't jump around
-        pos = nx.spring_layout(G, seed=42)  
-
-        # draw the basic graph first
-        nx.draw(G, pos, with_labels=True, 
-                node_color='lightblue',  # nice neutral color
-                edge_color='gray', node_size=600, 
-                font_size=10, ax=ax)
-
-        # show where we've been
-        if i > 0:
-            nx.draw_networkx_nodes(G, pos, 
-                                 nodelist=path[:i], 
-                                 node_color='lightblue',
-                                 edgecolors='black', 
-                                 linewidths=2, 
-                                 node_size=1200, ax=ax)
-
-        # highlight current node we're looking at
-        nx.draw_networkx_nodes(G, pos, 
-                             nodelist=[curr_node], 
-                             node_color='orange',
-                             edgecolors='black', 
-                             linewidths=4, 
-                             node_size=800, ax=ax)
+    # layout + edges only get done once, steps just restyle the nodes
+    renderer.draw_base(G, index.version)
+    # player steps through it with root.after so the window stays usable
+    player.load(path)
+
+def show_frame(path, first, last):
+    renderer.show_step(path, last)
+    # if frames got skipped, still list every node we went past
+    for curr_node in path[first:last + 1]:
         update_traversal_display(curr_node)
-        canvas.draw()
-        root.update()
-        time.sleep(1)  # pause between steps - might make this configurable
+
+def toggle_playback():
+    player.toggle()
+
+def step_playback():
+    player.step()
+
+def cancel_playback():
+    player.cancel()
+
+def change_speed(value):
+    player.set_fps(float(value))
 
 def get_user_input(prompt, expect_number=False):
     # helper for getting input from user
@@ -91,115 +90,248 @@ def run_search():
         print("Need both start and end nodes!")
         return
 
-    if start not in G.nodes or end not in G.nodes:
+    if start not in index or end not in index:
         print("Those nodes aren't in the graph!")
         return
 
     # figure out which algorithm to use
     algo = algorithm_var.get()
+    depth = None
     if algo == "Depth-Limited Search":
         # need depth limit for DLS
         depth = get_user_input("Max depth:", expect_number=True)
         if depth is None:
             print("Need a valid depth limit!")
             return
-        result = dls(G, start, end, int(depth))
-    else:  # must be BFS
-        result = bfs(G, start, end)
+
+    heuristic = None
+    if algo == "A* Search":
+        # straight-line distance on the drawn layout, scaled down so it never
+        # overestimates the real (weighted) distance
+        pos = renderer.layout(G, index.version)
+        heuristic = euclidean_heuristic(pos, layout_scale(index, pos))
+
+    # the search itself runs off the Tk thread, we just poll for the answer
+    global search_thread, search_stats
+    player.cancel()
+    search_button.config(state=tk.DISABLED)
+    search_stats = SearchStats()
+    search_thread = threading.Thread(target=search_worker,
+                                     args=(algo, start, end, depth, heuristic, search_stats),
+                                     daemon=True)
+    search_thread.start()
+    root.after(50, check_search_done)
+
+def search_worker(algo, start, end, depth, heuristic, stats):
+    try:
+        if algo == "Depth-Limited Search":
+            result = search_cache.dls(start, end, int(depth), stats)
+        elif algo == "Iterative Deepening DFS":
+            result = iddfs(index, start, end, stats=stats)  # no depth limit to guess
+        elif algo == "Bidirectional BFS":
+            result = bidirectional_bfs(index, start, end, stats)
+        elif algo == "Uniform-Cost Search":
+            result = ucs(index, start, end, stats)
+        elif algo == "A* Search":
+            result = astar(index, start, end, heuristic, stats)
+        else:  # must be BFS
+            result = search_cache.bfs(start, end, stats)
+    except Exception as e:  # don't leave the button disabled forever
+        print(f"Search failed: {e}")
+        result = None
+    search_results.put(result)
+
+def check_search_done():
+    try:
+        result = search_results.get_nowait()
+    except queue.Empty:
+        # still going, show the counters so far and check again soon
+        metrics_var.set(f"Searching... {search_stats}")
+        root.after(50, check_search_done)
+        return
+    search_button.config(state=tk.NORMAL)
+    metrics_var.set(str(search_stats))
     if result:
         print(f"Found path: {result}")
+        print(search_stats)
+        if result.path:
+            print(f"Start -> goal: {result.path}")
+        if result.cost is not None:
+            print(f"Path cost: {result.cost:g}")
         animate_path(result)
     else:
         print("Couldn't find a path :(")
     
     
 
+def search_running():
+    return search_thread is not None and search_thread.is_alive()
+
 def add_new_node():
+    if search_running():
+        print("Wait for the search to finish first")
+        return
     # grab node name and add to graph
     node = node_entry.get().strip()
     if node:  # make sure we got something
         G.add_node(node)
+        index.add_node(node)
         update_graph()
         node_entry.delete(0, tk.END)
 
 def add_new_edge():
+    if search_running():
+        print("Wait for the search to finish first")
+        return
     edge = edge_entry.get().strip()
     if edge:
         try:
-            # expect format like "A,B" or "A, B"
-            n1, n2 = edge.split(',')
-            n1, n2 = n1.strip(), n2.strip()
-            G.add_edge(n1, n2)
+            # expect format like "A,B" or "A, B", or "A,B,3" for a weighted edge
+            parts = [p.strip() for p in edge.split(',')]
+            if len(parts) == 2:
+                n1, n2 = parts
+                weight = 1.0
+            else:
+                n1, n2, weight = parts
+                weight = float(weight)
+                if weight < 0:
+                    raise ValueError
+            G.add_edge(n1, n2, weight=weight)
+            index.add_edge(n1, n2, weight)
             update_graph()
             edge_entry.delete(0, tk.END)
         except ValueError:
-            print("Edge should be 'NodeA,NodeB'")
+            print("Edge should be 'NodeA,NodeB' or 'NodeA,NodeB,weight'")
+
+def load_graph_file():
+    if search_running():
+        print("Wait for the search to finish first")
+        return
+    path = filedialog.askopenfilename(
+        title="Load graph",
+        filetypes=[("Edge lists", "*.txt *.csv"), ("Graph index", "*.gidx"), ("All files", "*")])
+    if not path:
+        return
+    global G, index, search_cache
+    try:
+        new_index = graph_io.load_graph(path)
+    except (OSError, ValueError) as e:
+        print(f"Couldn't load {path}: {e}")
+        return
+    # keep counting up so anything cached for the old graph gets dropped
+    new_index.version = index.version + 1
+    index = new_index
+    G = graph_io.to_networkx(index)
+    search_cache = SearchCache(index)
+    print(f"Loaded {len(index)} nodes from {path}")
+    update_graph()  # only redraw once, after everything is in
+
+def save_graph_file():
+    path = filedialog.asksaveasfilename(
+        title="Save graph", defaultextension=".txt",
+        filetypes=[("Edge list", "*.txt"), ("Graph index", "*.gidx")])
+    if path:
+        graph_io.save_graph(index, path)
+        print(f"Saved graph to {path}")
 
 def update_graph():
-    # redraw the graph
-    ax.clear()
-    pos = nx.spring_layout(G)
-    nx.draw(G, pos, with_labels=True, 
-            node_color='lightblue', 
-            edge_color='gray',
-            node_size=1200, 
-            font_size=15, ax=ax)
-    canvas.draw()
+    # redraw the graph, keeping the old layout as the starting point
+    player.cancel()
+    renderer.draw_graph(G, index.version)
 
 def update_traversal_display(visited_node):
     traversal_text.insert(tk.END, f"{visited_node}\n")
     traversal_text.see(tk.END) 
 
-# Main window setup
-root = tk.Tk()
-root.title("Graph Search Visualizer")
-root.geometry("1000x700")  # decent size for most screens
+def main():
+    global G, root, traversal_text, metrics_var, node_entry, edge_entry, algorithm_var
+    global renderer, player, search_button
+    import networkx as nx
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from graph_renderer import GraphRenderer
+    from path_player import PathPlayer
+    
+    G = nx.Graph()
+    
+    # Main window setup
+    root = tk.Tk()
+    root.title("Graph Search Visualizer")
+    root.geometry("1000x700")  # decent size for most screens
+
+    # Setup frames
+    input_frame = tk.Frame(root)
+    input_frame.pack(side=tk.TOP, pady=20)
+
+    graph_frame = tk.Frame(root)
+    graph_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True)
+
+    traversal_frame = tk.Frame(root)
+    traversal_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10)
 
-# Setup frames
-input_frame = tk.Frame(root)
-input_frame.pack(side=tk.TOP, pady=20)
+    tk.Label(traversal_frame, text="Traversal Path", font=('Arial', 12)).pack(pady=5)
 
-graph_frame = tk.Frame(root)
-graph_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True)
+    traversal_text = tk.Text(traversal_frame, height=20, width=30, font=('Arial', 12))
+    traversal_text.pack(pady=5)
 
-traversal_frame = tk.Frame(root)
-traversal_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10)
+    # Search metrics (nodes expanded, frontier size, runtime...)
+    metrics_var = tk.StringVar(value="No search run yet")
+    tk.Label(root, textvariable=metrics_var, font=('Arial', 10)).pack(side=tk.TOP)
 
-tk.Label(traversal_frame, text="Traversal Path", font=('Arial', 12)).pack(pady=5)
+    # Node input
+    tk.Label(input_frame, text="Node:").grid(row=0, column=0, padx=5)
+    node_entry = tk.Entry(input_frame)
+    node_entry.grid(row=0, column=1, padx=5)
 
-traversal_text = tk.Text(traversal_frame, height=20, width=30, font=('Arial', 12))
-traversal_text.pack(pady=5)
+    # Edge input
+    tk.Label(input_frame, text="Edge (A,B[,w]):").grid(row=0, column=2, padx=5)
+    edge_entry = tk.Entry(input_frame)
+    edge_entry.grid(row=0, column=3, padx=5)
 
-# Node input
-tk.Label(input_frame, text="Node:").grid(row=0, column=0, padx=5)
-node_entry = tk.Entry(input_frame)
-node_entry.grid(row=0, column=1, padx=5)
+    # Algorithm dropdown
+    tk.Label(input_frame, text="Search:").grid(row=0, column=4, padx=5)
+    algorithm_var = tk.StringVar()
+    algo_dropdown = ttk.Combobox(input_frame, textvariable=algorithm_var)
+    algo_dropdown['values'] = ("Depth-Limited Search", "Breadth-First Search",
+                               "Iterative Deepening DFS", "Bidirectional BFS",
+                               "Uniform-Cost Search", "A* Search")
+    algo_dropdown.grid(row=0, column=5, padx=5)
+    algo_dropdown.current(0)  # default to DLS
 
-# Edge input
-tk.Label(input_frame, text="Edge (A,B):").grid(row=0, column=2, padx=5)
-edge_entry = tk.Entry(input_frame)
-edge_entry.grid(row=0, column=3, padx=5)
+    # Setup matplotlib
+    fig, ax = plt.subplots(figsize=(6, 4))
+    canvas = FigureCanvasTkAgg(fig, master=graph_frame)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    renderer = GraphRenderer(ax, canvas)
+    player = PathPlayer(root, show_frame, fps=1.0)
 
-# Algorithm dropdown
-tk.Label(input_frame, text="Search:").grid(row=0, column=4, padx=5)
-algorithm_var = tk.StringVar()
-algo_dropdown = ttk.Combobox(input_frame, textvariable=algorithm_var)
-algo_dropdown['values'] = ("Depth-Limited Search", "Breadth-First Search")
-algo_dropdown.grid(row=0, column=5, padx=5)
-algo_dropdown.current(0)  # default to DLS
+    # Buttons
+    tk.Button(input_frame, text="Add Node", command=add_new_node).grid(
+        row=1, column=0, columnspan=2, pady=10)
+    tk.Button(input_frame, text="Add Edge", command=add_new_edge).grid(
+        row=1, column=2, columnspan=2, pady=10)
+    search_button = tk.Button(input_frame, text="Start Search", command=run_search)
+    search_button.grid(row=1, column=4, columnspan=2, pady=10)
+    tk.Button(input_frame, text="Load Graph...", command=load_graph_file).grid(
+        row=1, column=6, padx=5, pady=10)
+    tk.Button(input_frame, text="Save Graph...", command=save_graph_file).grid(
+        row=1, column=7, padx=5, pady=10)
 
-# Setup matplotlib
-fig, ax = plt.subplots(figsize=(6, 4))
-canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    # Playback controls
+    tk.Button(input_frame, text="Play/Pause", command=toggle_playback).grid(
+        row=2, column=0, pady=5)
+    tk.Button(input_frame, text="Step", command=step_playback).grid(
+        row=2, column=1, pady=5)
+    tk.Button(input_frame, text="Cancel", command=cancel_playback).grid(
+        row=2, column=2, pady=5)
+    tk.Label(input_frame, text="Steps/sec:").grid(row=2, column=3, padx=5)
+    speed_scale = tk.Scale(input_frame, from_=0.5, to=30, resolution=0.5,
+                           orient=tk.HORIZONTAL, command=change_speed)
+    speed_scale.set(1.0)
+    speed_scale.grid(row=2, column=4, columnspan=2)
 
-# Buttons
-tk.Button(input_frame, text="Add Node", command=add_new_node).grid(
-    row=1, column=0, columnspan=2, pady=10)
-tk.Button(input_frame, text="Add Edge", command=add_new_edge).grid(
-    row=1, column=2, columnspan=2, pady=10)
-tk.Button(input_frame, text="Start Search", command=run_search).grid(
-    row=1, column=4, columnspan=2, pady=10)
 
+    root.mainloop()
 
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Plays back a search path frame by frame using root.after() instead of
+# sleeping inside a Tk callback, so the window keeps responding.
+# Frames are tied to the clock: if drawing falls behind, the player jumps
+# straight to the frame that should be on screen now instead of queueing
+# up every frame it missed.
+import math
+import time
+
+
+class PathPlayer:
+    def __init__(self, root, on_frame, fps=1.0):
+        self.root = root
+        # on_frame(path, first, last) - show path[last], and path[first:last + 1]
+        # are the steps that are new since the previous frame (more than one if we skipped)
+        self.on_frame = on_frame
+        self.fps = fps
+        self.path = None
+        self.shown = -1
+        self.playing = False
+        self._after_id = None
+        self._t0 = 0.0
+        self._step0 = -1
+
+    def load(self, path, autoplay=True):
+        self.cancel()
+        self.path = path
+        self.shown = -1
+        if autoplay:
+            self.play()
+
+    def finished(self):
+        return self.path is None or self.shown >= len(self.path) - 1
+
+    def play(self):
+        if self.finished():
+            return
+        self.playing = True
+        self._anchor()
+        self._schedule(0)
+
+    def pause(self):
+        self.playing = False
+        self._unschedule()
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def step(self):
+        # one frame forward, and stay paused
+        self.pause()
+        if not self.finished():
+            self._show(self.shown + 1)
+
+    def cancel(self):
+        self.pause()
+        self.path = None
+        self.shown = -1
+
+    def set_fps(self, fps):
+        self.fps = max(float(fps), 0.01)
+        if self.playing:
+            # restart the clock from here so the next frame comes one new-speed tick later
+            self._anchor(delay=1 / self.fps)
+            self._unschedule()
+            self._schedule(int(1000 / self.fps))
+
+    def _anchor(self, delay=0.0):
+        # frame _step0 + 1 is due at _t0, and one more every 1 / fps after that
+        self._t0 = time.perf_counter() + delay
+        self._step0 = self.shown
+
+    def _schedule(self, delay_ms):
+        self._after_id = self.root.after(delay_ms, self._tick)
+
+    def _unschedule(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _show(self, step):
+        first = self.shown + 1
+        self.shown = step
+        self.on_frame(self.path, first, step)
+
+    def _tick(self):
+        self._after_id = None
+        if not self.playing or self.path is None:
+            return
+        # which frame should be up by now - anything in between gets skipped
+        elapsed = time.perf_counter() - self._t0
+        target = min(self._step0 + 1 + math.floor(elapsed * self.fps), len(self.path) - 1)
+        if target > self.shown:
+            self._show(target)
+        if self.finished():
+            self.playing = False
+            return
+        due = self._t0 + (target - self._step0) / self.fps
+        delay = max(0.0, due - time.perf_counter())
+        self._schedule(int(delay * 1000))
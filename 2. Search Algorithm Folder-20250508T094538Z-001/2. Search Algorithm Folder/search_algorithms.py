@@ -1,79 +1,525 @@
-from stack_queue import Stack, Queue  # my custom implementations
-import time
+from stack_queue import PairStack, Queue  # my custom implementations
+from graph_index import GraphIndex
+from search_stats import SearchStats
+from array import array
+from collections import namedtuple
+import heapq
+import math
 
-def dls(graph, root, goal, limit):
-    start_time = time.time()
-    # keep track of nodes we visit
-    path = []
-    seen = set()  
+# what the *_events generators hand out, as plain (kind, node, depth, frontier)
+# tuples so the search loop doesn't build objects or look up labels per edge:
+# kind - one of the constants below, node - id of the node it's about (in the
+# GraphIndex), depth - how deep that node is, frontier - queue/stack size right after.
+# labelled() turns them into SearchEvents with the node label instead
+SearchEvent = namedtuple("SearchEvent", ["kind", "node", "depth", "frontier"])
+VISIT = "visit"  # node popped and expanded (or about to be)
+ENQUEUE = "enqueue"  # bfs added a node to the queue
+PUSH = "push"  # dls added a node to the stack
+CUTOFF = "cutoff"  # dls hit the depth limit at this node
+GOAL = "goal"  # found the goal, the generator stops after this
+SKIP = "skip"  # popped a node that was already visited
+
+# how many expansions the bfs/dls loops do between copying their local
+# counters into stats, so a thread watching stats sees them go up
+FLUSH_EVERY = 4096
+
+class SearchResult(list):
+    # visit order, same as what bfs/dls always returned, plus a few extras:
+    # path - start->goal path if the algorithm knows it (None otherwise)
+    # expanded - how many times a node had its neighbors generated
+    # stats - SearchStats with the counters and timings for the run
+    # cost - total edge weight of path, for the weighted searches
+    def __init__(self, visited=(), path=None, expanded=0, stats=None, cost=None):
+        super().__init__(visited)
+        self.path = path
+        self.expanded = expanded
+        self.stats = stats
+        self.cost = cost
+
+def get_index(graph):
+    # searches run on the int-indexed CSR, build one if we got a plain networkx graph
+    if not isinstance(graph, GraphIndex):
+        graph = GraphIndex.from_graph(graph)
+    return graph.freeze()
+
+def _stats_base(stats):
+    # what stats held before a search started, see _flush
+    return (stats.expanded, stats.generated, stats.revisits_skipped, stats.cutoffs,
+            stats.peak_frontier)
+
+
+def _flush(stats, base, expanded, generated, skipped, cutoffs, peak):
+    # copy a search's local counters into stats, on top of what was there before
+    stats.expanded = base[0] + expanded
+    stats.generated = base[1] + generated
+    stats.revisits_skipped = base[2] + skipped
+    stats.cutoffs = base[3] + cutoffs
+    stats.peak_frontier = max(base[4], peak)
+
+
+def _run(steps):
+    # a *_steps generator made with emit=False never yields, the first next()
+    # runs the whole search and its return value comes back on StopIteration
+    try:
+        next(steps)
+    except StopIteration as done:
+        return done.value
+
+
+def _dls_steps(index, root_id, goal_id, limit, stats, emit):
+    # the one DLS loop, behind both dls_events() and dls(). With emit it
+    # yields the events as it goes and keeps nothing else, without it nothing
+    # is yielded and it returns the visited node ids in order. The counters
+    # are local ints that get copied into stats every FLUSH_EVERY expansions
+    # and when the search ends (or the caller stops early)
+    offsets, targets = index.offsets, index.targets
+    seen = index.visited_set()  # one byte per node id
+    order = array('q')
     
-    # need two stacks - one for nodes and one for depths
-    nodes = Stack(100)  # should be enough for most cases
-    depths = Stack(100)
+    # (node, depth) pairs packed into one int buffer, grows as needed
+    stack = PairStack()
     
     # start from root node
-    nodes.push(root)
-    depths.push(0)
+    stack.push(root_id, 0)
+    base = _stats_base(stats)
+    expanded = generated = skipped = cutoffs = 0
+    peak = 1
+    try:
+        while not stack.is_empty():  # while we still have nodes to explore
+            current, current_depth = stack.pop()
+            
+            if seen[current]:
+                skipped += 1
+                if emit:
+                    yield (SKIP, current, current_depth, len(stack))
+                continue  # skip if we've been here
+                
+            seen[current] = 1
+            expanded += 1
+            if not expanded % FLUSH_EVERY:
+                _flush(stats, base, expanded, generated, skipped, cutoffs, peak)
+            if emit:
+                yield (VISIT, current, current_depth, len(stack))
+            else:
+                order.append(current)
+            
+            if current == goal_id:  # found it!
+                if emit:
+                    yield (GOAL, current, current_depth, len(stack))
+                break
+            
+            # only go deeper if we haven't hit the limit
+            if current_depth == limit:
+                cutoffs += 1
+                if emit:
+                    yield (CUTOFF, current, current_depth, len(stack))
+            elif current_depth < limit:
+                # neighbors are pre-sorted, push them backwards
+                # so we still explore left-to-right off the stack
+                for next_node in reversed(targets[offsets[current]:offsets[current + 1]]):
+                    if not seen[next_node]:
+                        stack.push(next_node, current_depth + 1)
+                        generated += 1
+                        if emit:
+                            yield (PUSH, next_node, current_depth + 1, len(stack))
+                if len(stack) > peak:
+                    peak = len(stack)
+    finally:
+        _flush(stats, base, expanded, generated, skipped, cutoffs, peak)
+    return order
+
+
+def _bfs_steps(index, root_id, goal_id, stats, emit):
+    # the one BFS loop, behind both bfs_events() and bfs(), see _dls_steps
+    offsets, targets = index.offsets, index.targets
+    seen = index.visited_set()
+    order = array('q')
+    # level a node was first queued at, only the events need it
+    depth = array('q', [-1]) * len(index) if emit else None
     
-    while not nodes.is_empty():  # while we still have nodes to explore
-        current = nodes.pop()
-        current_depth = depths.pop()
-        
-        if current in seen:
-            continue  # skip if we've been here
+    # just need one queue for BFS
+    queue = Queue(typecode='q')  # ring buffer of node ids, no size cap
+    queue.enqueue(root_id)
+    if emit:
+        depth[root_id] = 0
+    base = _stats_base(stats)
+    expanded = generated = skipped = 0
+    peak = 1
+    try:
+        while not queue.is_empty():
+            current = queue.dequeue()
+            if seen[current]:
+                skipped += 1
+                if emit:
+                    yield (SKIP, current, depth[current], len(queue))
+                continue
+                
+            seen[current] = 1
+            expanded += 1
+            if not expanded % FLUSH_EVERY:
+                _flush(stats, base, expanded, generated, skipped, 0, peak)
+            if emit:
+                current_depth = depth[current]
+                yield (VISIT, current, current_depth, len(queue))
+            else:
+                order.append(current)
             
-        # debugging help
-        print(f"Visiting Node: {current} (Depth: {current_depth})")
-        path.append(current)
-        seen.add(current)
-        
-        if current == goal:  # found it!
-            break
-        
-        # only go deeper if we haven't hit the limit
-        if current_depth == limit and current != goal:
-            print("Goal not within limit")
-        elif current_depth < limit:
-            # reversed so we explore right-to-left
-            # might change this later if needed
-            for next_node in sorted(graph.neighbors(current), reverse=True):
-                if next_node not in seen:
-                    nodes.push(next_node)
-                    depths.push(current_depth + 1)
-
-        
-    end_time = time.time()
-    print(f"Runtime: {end_time - start_time:.9f} seconds")
-    return path
+            if current == goal_id:
+                if emit:
+                    yield (GOAL, current, current_depth, len(queue))
+                break  # found what we're looking for
+                
+            # neighbors come out of the index already sorted
+            # makes output more predictable
+            for next_node in targets[offsets[current]:offsets[current + 1]]:
+                if not seen[next_node]:
+                    queue.enqueue(next_node)
+                    generated += 1
+                    if emit:
+                        if depth[next_node] < 0:
+                            depth[next_node] = current_depth + 1
+                        yield (ENQUEUE, next_node, current_depth + 1, len(queue))
+            if len(queue) > peak:
+                peak = len(queue)
+    finally:
+        _flush(stats, base, expanded, generated, skipped, 0, peak)
+    return order
+
+
+def dls_events(graph, root, goal, limit, stats=None):
+    # same search as dls() but hands back what happens as it happens,
+    # so the caller can show progress, count things or just stop early.
+    # stats (if given) fills in as the events go by
+    index = get_index(graph)
+    stats = stats if stats is not None else SearchStats()
+    return _dls_steps(index, index.ids[root], index.ids.get(goal, -1), limit, stats, True)
+
+
+def bfs_events(graph, root, goal, stats=None):
+    # generator version of bfs(), see dls_events
+    index = get_index(graph)
+    stats = stats if stats is not None else SearchStats()
+    return _bfs_steps(index, index.ids[root], index.ids.get(goal, -1), stats, True)
+
+
+def labelled(graph, events):
+    # the events as SearchEvents with node labels, for callers that want to show them
+    labels = get_index(graph).labels
+    for kind, node, depth, frontier in events:
+        yield SearchEvent(kind, labels[node], depth, frontier)
+
+
+def _dls_search(index, root_id, goal_id, limit, stats):
+    # visited node ids in order, for dls() and the search cache
+    return _run(_dls_steps(index, root_id, goal_id, limit, stats, False))
 
 
-def bfs(graph, root, goal):
-    start_time = time.time()
+def _bfs_search(index, root_id, goal_id, stats):
+    return _run(_bfs_steps(index, root_id, goal_id, stats, False))
+
+
+def dls(graph, root, goal, limit, stats=None):
+    # pass in a SearchStats to watch the counters while it runs
+    # or to turn on memory tracking
+    stats = stats if stats is not None else SearchStats()
+    with stats.measure():
+        with stats.phase("index"):
+            index = get_index(graph)
+        with stats.phase("search"):
+            order = _dls_search(index, index.ids[root], index.ids.get(goal, -1), limit, stats)
+    labels = index.labels
+    return SearchResult([labels[i] for i in order], expanded=stats.expanded, stats=stats)
+
+
+def bfs(graph, root, goal, stats=None):
     # similar to DLS but using a queue instead
+    stats = stats if stats is not None else SearchStats()
+    with stats.measure():
+        with stats.phase("index"):
+            index = get_index(graph)
+        with stats.phase("search"):
+            order = _bfs_search(index, index.ids[root], index.ids.get(goal, -1), stats)
+    labels = index.labels
+    return SearchResult([labels[i] for i in order], expanded=stats.expanded, stats=stats)
+
+def bfs_tree(graph, root, stats=None):
+    # full BFS from root without stopping at a goal, used by the search cache
+    # returns node ids in visit order plus each node's parent id (-1 = not reached)
+    index = get_index(graph)
+    offsets, targets = index.offsets, index.targets
+    root_id = index.ids[root]
+    parent = array('q', [-1]) * len(index)
+    seen = index.visited_set()
+    order = array('q', [root_id])
+    seen[root_id] = 1
+    base = _stats_base(stats) if stats is not None else None
+    peak = 1
+    # order doubles as the queue, marking on enqueue gives the same order as bfs()
+    head = 0
+    while head < len(order):
+        current = order[head]
+        head += 1
+        if base is not None and not head % FLUSH_EVERY:
+            _flush(stats, base, head, len(order) - 1, 0, 0, peak)
+        for next_node in targets[offsets[current]:offsets[current + 1]]:
+            if not seen[next_node]:
+                seen[next_node] = 1
+                parent[next_node] = current
+                order.append(next_node)
+        if len(order) - head > peak:
+            peak = len(order) - head
+    if base is not None:
+        _flush(stats, base, len(order), len(order) - 1, 0, 0, peak)
+    return order, parent
+
+
+def iddfs(graph, root, goal, max_depth=None, stats=None):
+    # iterative deepening - depth limit 0, 1, 2, ... until we hit the goal
+    # so nobody has to guess a depth limit up front. Rounds resume where the
+    # last one stopped, so the visit order comes out level by level like bfs
+    stats = stats if stats is not None else SearchStats()
+    with stats.measure():
+        with stats.phase("index"):
+            index = get_index(graph)
+        with stats.phase("search"):
+            path = _iddfs_search(index, root, goal, max_depth, stats)
+    return SearchResult(path, expanded=stats.expanded, stats=stats)
+
+
+def _iddfs_search(index, root, goal, max_depth, stats):
+    # each round picks up from the nodes the last round cut off at its depth
+    # limit instead of starting over at the root, so nothing shallower gets
+    # expanded twice. The price is keeping those cut-off nodes between rounds,
+    # so memory goes like one BFS level instead of just the current path
+    labels = index.labels
+    offsets, targets = index.offsets, index.targets
+    goal_id = index.ids.get(goal, -1)
+    root_id = index.ids[root]
+
+    size = len(index)
+    best = array('q', [-1]) * size  # shallowest depth a node was pushed at, -1 = not yet
+    visited = index.visited_set()
+    stack = PairStack()
     path = []
-    seen = set()
-    
-    # just need one queue for BFS
-    queue = Queue(100)  # same size as DLS for consistency
-    queue.enqueue(root)
-    
-    while not queue.is_empty():
-        current = queue.dequeue()
-        if current in seen:
+
+    best[root_id] = 0
+    frontier = array('q', [root_id])  # where this round starts
+    limit = 0
+    while True:
+        cut = array('q')  # nodes this round stopped at, the next one starts there
+        for node in reversed(frontier):
+            stack.push(node, best[node])
+
+        while not stack.is_empty():
+            current, depth = stack.pop()
+            if depth > best[current]:
+                stats.revisits_skipped += 1
+                continue  # stale, found a shallower way here since this was pushed
+            if not visited[current]:
+                visited[current] = 1
+                path.append(labels[current])
+            if current == goal_id:
+                return path
+            if depth == limit:
+                stats.cutoffs += 1
+                cut.append(current)
+                continue
+            stats.expanded += 1
+            for next_node in reversed(targets[offsets[current]:offsets[current + 1]]):
+                # push again only if this is a shallower route than before
+                if best[next_node] < 0 or depth + 1 < best[next_node]:
+                    best[next_node] = depth + 1
+                    stack.push(next_node, depth + 1)
+                    stats.generated += 1
+            if len(stack) + len(cut) > stats.peak_frontier:
+                stats.peak_frontier = len(stack) + len(cut)
+
+        # nothing left below the limit, or we were told to stop here
+        if not cut or (max_depth is not None and limit >= max_depth):
+            break
+        frontier = cut
+        limit += 1
+
+    return path
+
+
+def bidirectional_bfs(graph, root, goal, stats=None):
+    # BFS from both ends at once, always growing the smaller frontier by a
+    # whole level, and stop when they meet - roughly b^(d/2) expansions per side
+    stats = stats if stats is not None else SearchStats()
+    with stats.measure():
+        with stats.phase("index"):
+            index = get_index(graph)
+        if index.directed:
+            raise ValueError("bidirectional_bfs needs an undirected graph")
+        with stats.phase("search"):
+            visited, path = _bidirectional_search(index, root, goal, stats)
+    return SearchResult(visited, path=path, expanded=stats.expanded, stats=stats)
+
+
+def _bidirectional_search(index, root, goal, stats):
+    labels = index.labels
+    offsets, targets = index.offsets, index.targets
+    root_id = index.ids[root]
+    goal_id = index.ids.get(goal, -1)
+    if goal_id < 0:
+        # goal isn't even in the graph, nothing to meet - same as a full bfs
+        tree_order, _ = bfs_tree(index, root, stats)
+        return [labels[i] for i in tree_order], None
+
+    size = len(index)
+    # side 0 grows from the root, side 1 from the goal
+    dist = (array('q', [-1]) * size, array('q', [-1]) * size)
+    parent = (array('q', [-1]) * size, array('q', [-1]) * size)
+    frontier = ([root_id], [goal_id])
+    dist[0][root_id] = 0
+    dist[1][goal_id] = 0
+    visited = [labels[root_id]]
+    if goal_id != root_id:
+        visited.append(labels[goal_id])
+    meet = root_id if root_id == goal_id else -1
+
+    while meet < 0 and frontier[0] and frontier[1]:
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        mine, other = dist[side], dist[1 - side]
+        parents = parent[side]
+        next_frontier = []
+        best_total = -1
+        for current in frontier[side]:
+            stats.expanded += 1
+            for next_node in targets[offsets[current]:offsets[current + 1]]:
+                if mine[next_node] < 0:
+                    mine[next_node] = mine[current] + 1
+                    parents[next_node] = current
+                    next_frontier.append(next_node)
+                    visited.append(labels[next_node])
+                if other[next_node] >= 0:
+                    # finish the level and keep the shortest meeting point
+                    total = mine[next_node] + other[next_node]
+                    if best_total < 0 or total < best_total:
+                        best_total = total
+                        meet = next_node
+        stats.generated += len(next_frontier)
+        if side == 0:
+            frontier = (next_frontier, frontier[1])
+        else:
+            frontier = (frontier[0], next_frontier)
+        stats.peak_frontier = max(stats.peak_frontier, len(frontier[0]) + len(frontier[1]))
+
+    path = None
+    if meet >= 0:
+        # root -> meet from side 0's parents, then meet -> goal from side 1's
+        path = []
+        current = meet
+        while current != -1:
+            path.append(labels[current])
+            current = parent[0][current]
+        path.reverse()
+        current = parent[1][meet]
+        while current != -1:
+            path.append(labels[current])
+            current = parent[1][current]
+    return visited, path
+
+
+def euclidean_heuristic(pos, scale=1.0):
+    # straight-line distance between two nodes' positions (e.g. the drawn layout)
+    # only admissible - so A* only guaranteed optimal - if no edge weighs less
+    # than scale * the distance between its two ends
+    def heuristic(node, goal):
+        (x1, y1), (x2, y2) = pos[node], pos[goal]
+        return scale * math.hypot(x1 - x2, y1 - y2)
+    return heuristic
+
+
+def layout_scale(graph, pos):
+    # biggest scale for euclidean_heuristic that never overestimates:
+    # the smallest weight / drawn length over all edges
+    index = get_index(graph)
+    labels, offsets, targets, weights = index.labels, index.offsets, index.targets, index.weights
+    scale = math.inf
+    for node_id in range(len(labels)):
+        x1, y1 = pos[labels[node_id]]
+        for slot in range(offsets[node_id], offsets[node_id + 1]):
+            x2, y2 = pos[labels[targets[slot]]]
+            length = math.hypot(x1 - x2, y1 - y2)
+            if length > 0:
+                scale = min(scale, weights[slot] / length)
+    return scale if scale != math.inf else 1.0
+
+
+def ucs(graph, root, goal, stats=None):
+    # uniform-cost search, cheapest total edge weight first
+    return astar(graph, root, goal, None, stats)
+
+
+def astar(graph, root, goal, heuristic=None, stats=None):
+    # A*: cheapest (cost so far + heuristic(node, goal)) first
+    # heuristic=None makes it plain uniform-cost search
+    stats = stats if stats is not None else SearchStats()
+    with stats.measure():
+        with stats.phase("index"):
+            index = get_index(graph)
+        if index.weights and min(index.weights) < 0:
+            raise ValueError("uniform-cost / A* search needs non-negative edge weights")
+        with stats.phase("search"):
+            visited, path, cost = _best_first_search(index, root, goal, heuristic, stats)
+    return SearchResult(visited, path=path, expanded=stats.expanded, stats=stats, cost=cost)
+
+
+def _best_first_search(index, root, goal, heuristic, stats):
+    labels = index.labels
+    offsets, targets, weights = index.offsets, index.targets, index.weights
+    root_id = index.ids[root]
+    goal_id = index.ids.get(goal, -1)
+    size = len(index)
+    cost = array('d', [math.inf]) * size
+    parent = array('q', [-1]) * size
+    closed = index.visited_set()
+    if heuristic is None or goal_id < 0:
+        estimate = None
+    else:
+        estimate = lambda node_id: heuristic(labels[node_id], goal)
+
+    # binary heap of (priority, tie breaker, node id). No decrease-key: a better
+    # route just pushes a new entry and the old one is skipped when it comes out
+    cost[root_id] = 0.0
+    heap = [(estimate(root_id) if estimate else 0.0, 0, root_id)]
+    pushes = 0
+    visited = []
+    while heap:
+        _, _, current = heapq.heappop(heap)
+        if closed[current]:
+            stats.revisits_skipped += 1  # stale entry, already done via a cheaper route
             continue
-            
-        print(f"Visiting Node: {current}")  # for debugging
-        path.append(current)
-        seen.add(current)
-        
-        if current == goal:
-            break  # found what we're looking for
-            
-        # explore neighbors in sorted order
-        # makes output more predictable
-        for next_node in sorted(graph.neighbors(current)):
-            if next_node not in seen:
-                queue.enqueue(next_node)
-    end_time = time.time()
-    print(f"Runtime: {end_time - start_time:.9f} seconds")
-    return path
\ No newline at end of file
+        closed[current] = 1
+        visited.append(labels[current])
+        stats.expanded += 1
+        if current == goal_id:
+            break
+        current_cost = cost[current]
+        # neighbors are in label order, the tie breaker keeps that order for equal priorities
+        for slot in range(offsets[current], offsets[current + 1]):
+            next_node = targets[slot]
+            if closed[next_node]:
+                continue
+            new_cost = current_cost + weights[slot]
+            if new_cost < cost[next_node]:
+                cost[next_node] = new_cost
+                parent[next_node] = current
+                pushes += 1
+                priority = new_cost + estimate(next_node) if estimate else new_cost
+                heapq.heappush(heap, (priority, pushes, next_node))
+                stats.generated += 1
+        if len(heap) > stats.peak_frontier:
+            stats.peak_frontier = len(heap)
+
+    if goal_id < 0 or not closed[goal_id]:
+        return visited, None, None
+    path = []
+    current = goal_id
+    while current != -1:
+        path.append(labels[current])
+        current = parent[current]
+    path.reverse()
+    return visited, path, cost[goal_id]
\ No newline at end of file
@@ -0,0 +1,128 @@
+# Cache for search results so repeated queries from the same start node
+# don't redo the whole traversal every time Start Search is clicked.
+#
+# Works because bfs() and dls() visit nodes in the same order no matter
+# what the goal is - the goal only decides where they stop. So we run each
+# (algorithm, source, limit) once without a goal, keep the full visit order
+# plus where each node shows up in it, and answer any goal by slicing.
+from array import array
+from collections import OrderedDict
+
+from search_algorithms import SearchResult, _dls_search, bfs_tree
+from search_stats import SearchStats
+
+
+class CachedTraversal:
+    def __init__(self, order, parent, size):
+        self.order = order  # node ids in visit order
+        self.parent = parent  # BFS predecessor tree (None for DLS)
+        # where each node id shows up in order, -1 if never visited
+        self.position = array('q', [-1]) * size
+        for i, node_id in enumerate(order):
+            self.position[node_id] = i
+
+    def nbytes(self):
+        total = self.order.itemsize * len(self.order)
+        total += self.position.itemsize * len(self.position)
+        if self.parent is not None:
+            total += self.parent.itemsize * len(self.parent)
+        return total
+
+
+class SearchCache:
+    def __init__(self, index, max_bytes=32 * 1024 * 1024):
+        self.index = index
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.version = index.version
+        self.entries = OrderedDict()  # (kind, source, limit) -> CachedTraversal, oldest first
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.used_bytes = 0
+
+    def _lookup(self, key):
+        # anything cached against an older graph is useless now
+        if self.index.version != self.version:
+            self.clear()
+            self.version = self.index.version
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def _store(self, key, entry):
+        size = entry.nbytes()
+        if size > self.max_bytes:
+            return  # wouldn't fit even on its own, don't bother
+        self.entries[key] = entry
+        self.used_bytes += size
+        # evict least recently used until we're back under budget
+        while self.used_bytes > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.used_bytes -= old.nbytes()
+
+    def _traversal(self, kind, source, limit=None, stats=None):
+        key = (kind, source, limit)
+        entry = self._lookup(key)
+        if stats is not None:
+            stats.cache_hit = entry is not None
+        if entry is None:
+            stats = stats if stats is not None else SearchStats()
+            index = self.index.freeze()
+            if kind == "bfs":
+                order, parent = bfs_tree(index, source, stats)
+            else:
+                order = _dls_search(index, index.ids[source], -1, limit, stats)
+                parent = None
+            entry = CachedTraversal(order, parent, len(index))
+            self._store(key, entry)
+        return entry
+
+    def _visit_prefix(self, entry, goal, stats):
+        # visit order up to and including the goal, or everything if it wasn't reached
+        goal_id = self.index.ids.get(goal, -1)
+        stop = entry.position[goal_id] + 1 if goal_id >= 0 else 0
+        if stop <= 0:
+            stop = len(entry.order)
+        labels = self.index.labels
+        return SearchResult([labels[i] for i in entry.order[:stop]],
+                            expanded=stats.expanded, stats=stats)
+
+    def _walk_parents(self, entry, goal):
+        # follow the BFS predecessor tree back from the goal, O(path length)
+        goal_id = self.index.ids.get(goal, -1)
+        if goal_id < 0 or entry.position[goal_id] < 0:
+            return None
+        labels = self.index.labels
+        path = []
+        current = goal_id
+        while current != -1:
+            path.append(labels[current])
+            current = entry.parent[current]
+        path.reverse()
+        return path
+
+    # same results as search_algorithms.bfs / dls, stats only counts
+    # the work actually done (nothing on a cache hit)
+    def bfs(self, root, goal, stats=None):
+        stats = stats if stats is not None else SearchStats()
+        with stats.measure():
+            entry = self._traversal("bfs", root, None, stats)
+            result = self._visit_prefix(entry, goal, stats)
+            result.path = self._walk_parents(entry, goal)  # cheap, the tree is already there
+        result.expanded = stats.expanded
+        return result
+
+    def dls(self, root, goal, limit, stats=None):
+        stats = stats if stats is not None else SearchStats()
+        with stats.measure():
+            entry = self._traversal("dls", root, limit, stats)
+            result = self._visit_prefix(entry, goal, stats)
+        result.expanded = stats.expanded
+        return result
@@ -0,0 +1,79 @@
+# Counters and timings for a search run - replaces printing every node.
+# Plain int counters are cheap enough to always be on. Memory tracking
+# (tracemalloc) is slow, so it's only done when asked for.
+#
+# The fields are updated while the search runs, so another thread (the GUI)
+# can read them for live progress. The bfs/dls loops keep local counts and
+# copy them in every few thousand expansions, the other searches add to the
+# fields directly.
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class SearchStats:
+    def __init__(self, track_memory=False):
+        self.expanded = 0  # nodes popped and visited
+        self.generated = 0  # nodes added to the queue/stack
+        self.peak_frontier = 0  # biggest the queue/stack got
+        self.revisits_skipped = 0  # popped again after already being visited
+        self.cutoffs = 0  # nodes where the depth limit stopped us
+        self.timings = {}  # phase name -> nanoseconds
+        self.track_memory = track_memory
+        self.peak_memory = None  # bytes, only if track_memory
+        self.cache_hit = None  # set when the answer came from SearchCache
+        self.done = False
+
+    @contextmanager
+    def phase(self, name):
+        # time a block with perf_counter_ns, adds up if the same phase runs twice
+        start = time.perf_counter_ns()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self.timings[name] = self.timings.get(name, 0) + elapsed
+
+    @contextmanager
+    def measure(self):
+        # wraps a whole run: total time, plus peak memory if wanted
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        try:
+            with self.phase("total"):
+                yield self
+        finally:
+            if self.track_memory:
+                self.peak_memory = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            self.done = True
+
+    def seconds(self, name="total"):
+        return self.timings.get(name, 0) / 1e9
+
+    def as_dict(self):
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "peak_frontier": self.peak_frontier,
+            "revisits_skipped": self.revisits_skipped,
+            "cutoffs": self.cutoffs,
+            "timings_ns": dict(self.timings),
+            "peak_memory": self.peak_memory,
+            "cache_hit": self.cache_hit,
+        }
+
+    def __str__(self):
+        text = (f"Expanded: {self.expanded}  Generated: {self.generated}  "
+                f"Peak frontier: {self.peak_frontier}  Skipped: {self.revisits_skipped}  "
+                f"Cutoffs: {self.cutoffs}  Time: {self.seconds() * 1000:.3f} ms")
+        if self.peak_memory is not None:
+            text += f"  Peak memory: {self.peak_memory / 1024:.1f} KiB"
+        if self.cache_hit:
+            text += "  (cached)"
+        return text
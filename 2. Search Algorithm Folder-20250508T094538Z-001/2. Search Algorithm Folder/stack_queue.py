@@ -1,51 +1,152 @@
 # Implementing basic stack and queue data structures
-# Note to self: might want to add error handling later...
+# Both grow as needed now, max_size is optional and what happens when
+# it's hit is up to the overflow policy (used to silently drop items).
+# Pass typecode='q' to keep int ids packed in an array instead of a list.
+from array import array
+
+# overflow policies for when max_size is reached
+GROW = "grow"  # ignore the limit and keep growing
+RAISE = "raise"  # throw an OverflowError
+BOUNDED = "bounded"  # drop the new item (the old behaviour)
+
+
+def _check_overflow(policy, kind):
+    # returns True if the item should be kept anyway
+    if policy == GROW:
+        return True
+    if policy == RAISE:
+        raise OverflowError(f"{kind} is full")
+    if policy == BOUNDED:
+        return False
+    raise ValueError(f"Unknown overflow policy: {policy}")
+
+
+def _empty_buffer(typecode, size):
+    if typecode is None:
+        return [None] * size
+    return array(typecode, bytes(array(typecode).itemsize * size))
+
 
 class Stack:
-    def __init__(self, max_size):  # default size should be enough for now
-        self.stuff = []  # using a simple list to store items
-        self.size_limit = max_size  
-    
-    # adds new item to stack if there's room
+    def __init__(self, max_size=None, overflow=RAISE, typecode=None):
+        # list append/pop (or array append/pop) is already amortized O(1)
+        self.stuff = [] if typecode is None else array(typecode)
+        self.size_limit = max_size
+        self.overflow = overflow
+
+    # adds new item to stack, checking the limit if there is one
     def push(self, item):
-        if len(self.stuff) < self.size_limit:
-            self.stuff.append(item)
-    
+        if self.size_limit is not None and len(self.stuff) >= self.size_limit:
+            if not _check_overflow(self.overflow, "Stack"):
+                return
+        self.stuff.append(item)
+
     def pop(self):
         # check if empty first to avoid errors
         if not self.is_empty():
             return self.stuff.pop()
-        return None 
-    
+        return None
+
     def is_empty(self):
         return len(self.stuff) == 0
-    
+
+    def __len__(self):
+        return len(self.stuff)
+
     def __str__(self):
         # quick way to see what's in the stack
-        return f"Stack: {self.stuff}"
+        return f"Stack: {list(self.stuff)}"
+
+
+# Stack of (node, depth) style pairs kept in one packed buffer
+# instead of two parallel stacks, used by dls
+class PairStack:
+    def __init__(self, max_size=None, overflow=RAISE, typecode='q'):
+        self.stuff = [] if typecode is None else array(typecode)
+        self.size_limit = max_size  # counted in pairs, not slots
+        self.overflow = overflow
+
+    def push(self, first, second):
+        if self.size_limit is not None and len(self.stuff) >= 2 * self.size_limit:
+            if not _check_overflow(self.overflow, "PairStack"):
+                return
+        self.stuff.append(first)
+        self.stuff.append(second)
+
+    def pop(self):
+        if not self.is_empty():
+            second = self.stuff.pop()
+            return self.stuff.pop(), second
+        return None
+
+    def is_empty(self):
+        return len(self.stuff) == 0
+
+    def __len__(self):
+        return len(self.stuff) // 2
+
+    def __str__(self):
+        pairs = list(zip(self.stuff[::2], self.stuff[1::2]))
+        return f"PairStack: {pairs}"
 
 
-# Queue implementation - pretty similar to stack
-# but different order of operations
+# Queue implementation - growable ring buffer
+# head points at the oldest item, count is how many are stored
 class Queue:
-    def __init__(self, max_size=100):
-        self.data = []  # different name than stack's list
+    def __init__(self, max_size=None, overflow=RAISE, typecode=None, capacity=16):
+        self.typecode = typecode
+        self.data = _empty_buffer(typecode, capacity)
+        self.head = 0
+        self.count = 0
         self.max_size = max_size
-    
-    # add to front - might be slower but works
+        self.overflow = overflow
+
+    # add to the back - O(1) unless we have to grow the buffer
     def enqueue(self, item):
-        if len(self.data) < self.max_size:
-            self.data.insert(0, item)  # insert at beginning
-            
+        if self.max_size is not None and self.count >= self.max_size:
+            if not _check_overflow(self.overflow, "Queue"):
+                return
+        capacity = len(self.data)
+        if self.count == capacity:
+            self._grow()
+            capacity = len(self.data)
+        tail = self.head + self.count
+        if tail >= capacity:
+            tail -= capacity
+        self.data[tail] = item
+        self.count += 1
+
+    def _grow(self):
+        # unwrap so head is back at 0, then double the space
+        capacity = len(self.data)
+        self.data = (self.data[self.head:] + self.data[:self.head]
+                     + _empty_buffer(self.typecode, max(capacity, 1)))
+        self.head = 0
+
     def dequeue(self):
-        # remove from end if possible
+        # remove from the front if possible
         if not self.is_empty():
-            return self.data.pop()
+            item = self.data[self.head]
+            if self.typecode is None:
+                self.data[self.head] = None  # don't hold on to old items
+            self.head += 1
+            if self.head == len(self.data):
+                self.head = 0
+            self.count -= 1
+            return item
         return None
-    
-    # copied from stack because it works the same way
+
+    # same idea as the stack
     def is_empty(self):
-        return len(self.data) == 0
-    
+        return self.count == 0
+
+    def __len__(self):
+        return self.count
+
+    def items(self):
+        # oldest first
+        capacity = len(self.data)
+        return [self.data[(self.head + i) % capacity] for i in range(self.count)]
+
     def __str__(self):
-        return f"Queue: {self.data}"  # same format as stack for consistency
\ No newline at end of file
+        return f"Queue: {self.items()}"  # same format as stack for consistency
@@ -0,0 +1,157 @@
+# Level-synchronous BFS with numpy, for graphs too big for the node-at-a-time bfs().
+# Instead of popping one node per loop, each loop expands a whole level:
+# gather every neighbor of the frontier out of the CSR arrays, throw away the
+# visited ones, dedupe, and that's the next level.
+#
+# When the frontier's edges outnumber the edges of everything still unvisited
+# it flips to bottom-up: every unvisited node looks for a parent in the
+# frontier instead, which is less work on the big middle levels.
+#
+# Visit order comes out exactly like bfs(): a node's parent is its earliest
+# neighbor in the previous level, and nodes with the same parent come in
+# that parent's neighbor order (which is label order, see GraphIndex).
+import numpy as np
+
+from search_algorithms import SearchResult, get_index
+from search_stats import SearchStats
+
+NOT_FOUND = np.iinfo(np.int64).max
+
+
+def _gather(offsets, targets, nodes):
+    # all neighbors of nodes, row after row, plus which entry of nodes each came from
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(nodes)), counts)
+    # slot of each neighbor in targets: its row start + how far into the row it is
+    row_begin = np.cumsum(counts) - counts
+    slots = np.arange(total) - row_begin[owner] + starts[owner]
+    return targets[slots], owner, counts
+
+
+class VectorBFS:
+    def __init__(self, graph, alpha=1.0):
+        self.index = get_index(graph)
+        # go bottom-up once frontier edges * alpha > unvisited edges
+        self.alpha = alpha
+        self.version = -1
+        self._build()
+
+    def _build(self):
+        # numpy copies of the CSR arrays, redone when the graph changes
+        # (copies, not views: a view would stop the index from growing its arrays)
+        index = self.index.freeze()
+        size = len(index)
+        self.offsets = np.frombuffer(index.offsets, dtype=np.int64).copy()
+        self.targets = np.frombuffer(index.targets, dtype=np.int64).copy()
+        self.degree = np.diff(self.offsets)
+        if index.directed:
+            # bottom-up needs who points *at* a node, so build the reversed CSR too
+            sources = np.repeat(np.arange(size), self.degree)
+            by_target = np.argsort(self.targets, kind='stable')
+            self.in_targets = sources[by_target]
+            self.in_offsets = np.zeros(size + 1, np.int64)
+            np.cumsum(np.bincount(self.targets, minlength=size), out=self.in_offsets[1:])
+        else:
+            self.in_offsets, self.in_targets = self.offsets, self.targets
+        self.in_degree = np.diff(self.in_offsets)
+        self._rank = None
+        self.version = index.version
+
+    def rank(self):
+        # position of each node in label order, only needed for bottom-up steps
+        if self._rank is None:
+            labels = self.index.labels
+            order = sorted(range(len(labels)), key=labels.__getitem__)
+            self._rank = np.empty(len(labels), np.int64)
+            self._rank[order] = np.arange(len(labels))
+        return self._rank
+
+    def _top_down(self, frontier, depth):
+        neighbors, owner, _ = _gather(self.offsets, self.targets, frontier)
+        fresh = depth[neighbors] < 0
+        neighbors, owner = neighbors[fresh], owner[fresh]
+        # first time each node shows up, in frontier order then row order
+        _, first = np.unique(neighbors, return_index=True)
+        first.sort()
+        return neighbors[first], frontier[owner[first]]
+
+    def _bottom_up(self, frontier, depth):
+        unvisited = np.flatnonzero(depth < 0)
+        unvisited = unvisited[self.in_degree[unvisited] > 0]
+        if not len(unvisited):
+            return unvisited, unvisited
+        place = np.full(len(depth), NOT_FOUND, np.int64)  # node -> position in frontier
+        place[frontier] = np.arange(len(frontier))
+        neighbors, _, counts = _gather(self.in_offsets, self.in_targets, unvisited)
+        # earliest frontier neighbor of each unvisited node, same parent top-down picks
+        best = np.minimum.reduceat(place[neighbors], np.cumsum(counts) - counts)
+        found = best != NOT_FOUND
+        nodes, best = unvisited[found], best[found]
+        order = np.lexsort((self.rank()[nodes], best))
+        return nodes[order], frontier[best[order]]
+
+    def tree(self, root, goal=None, stats=None):
+        # returns (order, parent, depth) numpy arrays of node ids; parent and
+        # depth are -1 for nodes that weren't reached. With a goal it stops
+        # at the level where the goal turns up and order ends at the goal
+        if self.version != self.index.version:
+            self._build()
+        size = len(self.index)
+        root_id = self.index.ids[root]
+        goal_id = self.index.ids.get(goal, -1)
+        depth = np.full(size, -1, np.int64)
+        parent = np.full(size, -1, np.int64)
+        depth[root_id] = 0
+        frontier = np.array([root_id], np.int64)
+        levels = [frontier]
+        unvisited_edges = int(self.in_degree.sum() - self.in_degree[root_id])
+        peak = 1
+        level = 0
+        while len(frontier) and root_id != goal_id:
+            frontier_edges = int(self.degree[frontier].sum())
+            if frontier_edges * self.alpha > unvisited_edges:
+                frontier, parents = self._bottom_up(frontier, depth)
+            else:
+                frontier, parents = self._top_down(frontier, depth)
+            level += 1
+            depth[frontier] = level
+            parent[frontier] = parents
+            unvisited_edges -= int(self.in_degree[frontier].sum())
+            peak = max(peak, len(frontier))
+            levels.append(frontier)
+            if goal_id >= 0 and depth[goal_id] >= 0:
+                # drop whatever comes after the goal in its level
+                levels[-1] = frontier[:int(np.flatnonzero(frontier == goal_id)[0]) + 1]
+                break
+        order = np.concatenate(levels)
+        if stats is not None:
+            stats.expanded += len(order)
+            stats.generated += len(order) - 1
+            stats.peak_frontier = max(stats.peak_frontier, peak)
+        return order, parent, depth
+
+    def bfs(self, root, goal, stats=None):
+        # same answer as search_algorithms.bfs, as a SearchResult with labels
+        stats = stats if stats is not None else SearchStats()
+        with stats.measure():
+            with stats.phase("search"):
+                order, parent, _ = self.tree(root, goal, stats)
+        labels = self.index.labels
+        path = None
+        goal_id = self.index.ids.get(goal, -1)
+        if goal_id >= 0 and len(order) and order[-1] == goal_id:
+            path = []
+            node = goal_id
+            while node != -1:
+                path.append(labels[node])
+                node = parent[node]
+            path.reverse()
+        visited = [labels[node_id] for node_id in order.tolist()]
+        return SearchResult(visited, path=path, expanded=stats.expanded, stats=stats)
+
+
+def vector_bfs(graph, root, goal, stats=None):
+    # one-off version, keep a VectorBFS around to reuse its arrays between searches
+    return VectorBFS(graph).bfs(root, goal, stats)
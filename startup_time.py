@@ -0,0 +1,114 @@
+# Tracks how long the modules of both projects take to import.
+# Every module gets imported in a fresh interpreter with python -X importtime
+# and no DISPLAY, so nothing is already cached from an earlier import and
+# anything that opens a window at import time fails. The report shows each
+# module's own cumulative import time and flags any that dragged in a GUI or
+# plotting library. The core modules may only use numpy and the standard
+# library; the two apps may import tkinter, but matplotlib and networkx
+# should wait until their main window actually gets built.
+#
+# usage:
+#   python startup_time.py                  # table of every core and app module
+#   python startup_time.py --budget-ms 150  # exit 1 if any module goes over
+#   python startup_time.py --repeat 5 -o startup.json
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SEARCH_DIR = os.path.join(HERE, "2. Search Algorithm Folder-20250508T094538Z-001",
+                          "2. Search Algorithm Folder")
+NEURAL_DIR = os.path.join(HERE, "1. Backpropagation Network Folder-20250508T094549Z-001",
+                          "1. Backpropagation Network Folder")
+
+# folder -> modules that must import with only numpy and the standard library
+CORE_MODULES = {
+    SEARCH_DIR: ["stack_queue", "graph_index", "search_stats", "search_algorithms",
+                 "search_cache", "graph_io", "vector_bfs", "batch_search", "path_player"],
+    NEURAL_DIR: ["optimizers", "datasets", "neural_network", "ensemble_training",
+                 "decision_boundary", "loss_plot"],
+}
+# the two Tk apps, importing them mustn't need a display or plotting libraries
+APP_MODULES = {
+    SEARCH_DIR: ["main_gui"],
+    NEURAL_DIR: ["backpropagation_neural_network"],
+}
+GUI_MODULES = ("tkinter", "matplotlib", "networkx", "scipy")
+APP_ALLOWED = ("tkinter",)
+
+
+def import_time(folder, module):
+    # (cumulative microseconds for module, top-level packages it pulled in)
+    env = {k: v for k, v in os.environ.items() if k not in ("DISPLAY", "WAYLAND_DISPLAY")}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=folder, capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"import {module} failed without a display:\n" + "\n".join(errors))
+    total = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        name = name.strip()
+        loaded.add(name.split(".")[0])
+        if name == module:
+            total = int(cumulative)
+    return total, sorted(loaded & set(GUI_MODULES))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time of the core and app modules")
+    parser.add_argument("modules", nargs="*", help="only these (default: all of them)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module, best one counts")
+    parser.add_argument("--budget-ms", type=float, help="fail if a module takes longer")
+    parser.add_argument("-o", "--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for kind, groups in (("core", CORE_MODULES), ("app", APP_MODULES)):
+        for folder, modules in groups.items():
+            for module in modules:
+                if args.modules and module not in args.modules:
+                    continue
+                try:
+                    runs = [import_time(folder, module) for _ in range(args.repeat)]
+                except RuntimeError as e:
+                    rows.append({"module": module, "folder": os.path.basename(folder),
+                                 "kind": kind, "ms": None, "gui_imports": [], "error": str(e)})
+                    continue
+                best = min(total for total, _ in runs)
+                allowed = APP_ALLOWED if kind == "app" else ()
+                rows.append({"module": module, "folder": os.path.basename(folder), "kind": kind,
+                             "ms": best / 1000,
+                             "gui_imports": [m for m in runs[0][1] if m not in allowed]})
+
+    failed = False
+    for row in rows:
+        problems = []
+        if "error" in row:
+            failed = True
+            print(f"{row['module']:<30} {'-':>8}     {row['error']}")
+            continue
+        if row["gui_imports"]:
+            problems.append("imports " + ", ".join(row["gui_imports"]))
+        if args.budget_ms is not None and row["ms"] > args.budget_ms:
+            problems.append(f"over {args.budget_ms:g} ms")
+        failed = failed or bool(problems)
+        print(f"{row['module']:<30} {row['ms']:8.1f} ms  {'; '.join(problems) or 'ok'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": sys.version.split()[0], "budget_ms": args.budget_ms,
+                       "results": rows}, f, indent=2)
+            f.write("\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())